@@ -6,13 +6,23 @@ while keeping placeholders for Claude, Gemini, DeepSeek, and Ollama.
 """
 
 import os
-from typing import Tuple, Dict, Any
-from utils import debug_prompt, debug_response
+import asyncio
+from dataclasses import dataclass, field
+import threading
+import concurrent.futures
+import atexit
+import importlib.util
+import inspect
+from typing import Tuple, Dict, Any, Callable, Awaitable, List, Union, AsyncIterator, Optional
+from utils import debug_prompt, debug_response, json_dumps, json_loads
+from rate_limiter import get_rate_limiter
+from api_timeout import call_with_timeout
 import time  # Add this import at the top
-from cache_manager import cache_manager, init_cache
+from contextlib import nullcontext
+from cache_manager import get_cache
+from semantic_cache import get_semantic_cache, EMBEDDING_MODEL
 import sys
-import json
-from api_timeout import call_with_timeout  # Add this import
+import hashlib
 
 # Try importing required packages with helpful error messages
 try:
@@ -21,22 +31,60 @@ except ImportError:
     print("Error: openai package not found. Please install it with: pip install openai")
     openai = None
 
+def _openai_accepts_prompt_cache_key() -> bool:
+    """Older openai 1.x releases reject prompt_cache_key with a TypeError, so it is only sent when supported"""
+    try:
+        from openai.resources.chat.completions import AsyncCompletions
+        return "prompt_cache_key" in inspect.signature(AsyncCompletions.create).parameters
+    except (ImportError, AttributeError, TypeError, ValueError):
+        return False
+
+OPENAI_PROMPT_CACHE_KEY = openai is not None and _openai_accepts_prompt_cache_key()
+
+# anthropic and google-generativeai pull in large dependency trees, so they are
+# imported on first use of their provider (_ensure_anthropic / _ensure_genai)
+anthropic = None
+genai = None
+
+def _ensure_anthropic():
+    """Import the anthropic package on first use. Returns None if it is not installed"""
+    global anthropic
+    if anthropic is None:
+        try:
+            import anthropic as anthropic_module
+        except ImportError:
+            print("Error: anthropic package not found. Please install it with: pip install anthropic")
+            return None
+        anthropic = anthropic_module
+    return anthropic
+
+def _ensure_genai():
+    """Import the google-generativeai package on first use. Returns None if it is not installed"""
+    global genai
+    if genai is None:
+        try:
+            import google.generativeai as genai_module
+        except ImportError:
+            print("Error: google-generativeai package not found. Please install it with: pip install google-generativeai")
+            return None
+        genai = genai_module
+    return genai
+
 try:
-    import anthropic
+    # Optional tracing: spans are exported wherever the application configures the OpenTelemetry SDK
+    from opentelemetry import trace
+    tracer = trace.get_tracer(__name__)
 except ImportError:
-    print("Error: anthropic package not found. Please install it with: pip install anthropic")
-    anthropic = None
+    tracer = None
 
 try:
-    import google.generativeai as genai
+    import httpx
 except ImportError:
-    print("Error: google-generativeai package not found. Please install it with: pip install google-generativeai")
-    genai = None
+    print("Error: httpx package not found. Please install it with: pip install httpx")
+    httpx = None
 
 # Get API keys from environment
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-PROMPT_DEBUG = os.getenv("PROMPT_DEBUG")
-print(f"AI Connectors: PROMPT_DEBUG from env: {PROMPT_DEBUG}")
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 DEEPSEEK_API_KEY = os.getenv("DEEPSEEK_API_KEY")
@@ -47,129 +95,384 @@ OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama2")
 if OPENAI_API_KEY and openai:
     openai.api_key = OPENAI_API_KEY
 
+# HTTP timeouts (connect, read) for the raw HTTP providers, so a stalled socket is closed
+if httpx:
+    DEEPSEEK_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+    OLLAMA_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+    # A batched completion is not streamed, so nothing arrives until every prompt has been generated
+    OLLAMA_BATCH_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+def _validate_openai():
+    if not openai:
+        raise ImportError("OpenAI package not installed. Run: pip install openai")
+    if not OPENAI_API_KEY:
+        raise ValueError("OpenAI API key not found in .env file")
+
+def _validate_claude():
+    if not _ensure_anthropic():
+        raise ImportError("Anthropic package not installed. Run: pip install anthropic")
+    if not ANTHROPIC_API_KEY:
+        raise ValueError("Anthropic API key not found in .env file")
+
+def _validate_gemini():
+    if not _ensure_genai():
+        raise ImportError("Google Generative AI package not installed. Run: pip install google-generativeai")
+    if not GOOGLE_API_KEY:
+        raise ValueError("Google API key not found in .env file")
+
+def _validate_deepseek():
+    if not DEEPSEEK_API_KEY:
+        raise ValueError("DeepSeek API key not found in .env file")
+
+# Key/package checks per model; models without an entry (ollama) need nothing
+VALIDATORS: Dict[str, Callable[[], None]] = {
+    "openai-gpt": _validate_openai,
+    "claude": _validate_claude,
+    "gemini": _validate_gemini,
+    "deepseek": _validate_deepseek,
+}
+
 def validate_api_keys(model_name: str) -> bool:
     """Validate that required API keys and packages are present for the selected model"""
-    if model_name == "openai-gpt":
-        if not openai:
-            raise ImportError("OpenAI package not installed. Run: pip install openai")
-        if not OPENAI_API_KEY:
-            raise ValueError("OpenAI API key not found in .env file")
-        print(f"Debug: Using OpenAI with key starting with: {OPENAI_API_KEY[:8]}...")
-    elif model_name == "claude":
-        if not anthropic:
-            raise ImportError("Anthropic package not installed. Run: pip install anthropic")
-        if not ANTHROPIC_API_KEY:
-            raise ValueError("Anthropic API key not found in .env file")
-    elif model_name == "gemini":
-        if not genai:
-            raise ImportError("Google Generative AI package not installed. Run: pip install google-generativeai")
-        if not GOOGLE_API_KEY:
-            raise ValueError("Google API key not found in .env file")
-    elif model_name == "deepseek" and not DEEPSEEK_API_KEY:
-        raise ValueError("DeepSeek API key not found in .env file")
+    validator = VALIDATORS.get(model_name)
+    if validator is not None:
+        validator()
     return True
 
-def call_openai_gpt(prompt: str, model_name: str = "gpt-3.5-turbo") -> Tuple[str, Dict]:
+# Provider clients are created once, on first use, and reused for every call so
+# connections (and TLS sessions) stay alive between requests. They are created lazily
+# because a missing API key makes the SDK constructors raise.
+_openai_client = None
+_anthropic_client = None
+_gemini_model = None
+_http_client = None
+
+def _get_openai_client():
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = openai.AsyncOpenAI(api_key=OPENAI_API_KEY)
+    return _openai_client
+
+def _get_anthropic_client():
+    global _anthropic_client
+    if _anthropic_client is None:
+        _anthropic_client = _ensure_anthropic().AsyncAnthropic(api_key=ANTHROPIC_API_KEY)
+    return _anthropic_client
+
+def _get_gemini_model():
+    global _gemini_model
+    if _gemini_model is None:
+        _ensure_genai().configure(api_key=GOOGLE_API_KEY)
+        _gemini_model = genai.GenerativeModel('gemini-pro')
+    return _gemini_model
+
+def _get_http_client():
+    """Shared HTTP client for DeepSeek and Ollama"""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            # HTTP/2 multiplexes concurrent requests over one connection; needs the h2 package (httpx[http2])
+            http2=importlib.util.find_spec("h2") is not None,
+            timeout=httpx.Timeout(60.0, connect=5.0),
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+        )
+    return _http_client
+
+def _close_clients():
+    """Close the shared provider clients on exit so pooled connections shut down cleanly"""
+    if _loop is None or not _loop.is_running():
+        return
+    for client in (_http_client, _openai_client, _anthropic_client):
+        if client is None:
+            continue
+        close = client.aclose if hasattr(client, "aclose") else client.close
+        try:
+            asyncio.run_coroutine_threadsafe(close(), _loop).result(timeout=5)
+        except Exception:
+            pass
+
+atexit.register(_close_clients)
+
+@dataclass
+class ProviderResult:
+    """What a provider call returns: ok is False when text is an error message"""
+    ok: bool
+    text: str
+    usage: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def error(cls, model_name: str, e) -> "ProviderResult":
+        return cls(False, f"[{model_name} ERROR]: {str(e)}", {"error": str(e), "ttfb_seconds": 0})
+
+class ModelCallAborted(Exception):
+    """Raised inside the event loop instead of sys.exit(); the sync wrapper turns it back into an exit"""
+    def __init__(self, exit_code: int = 0):
+        super().__init__(f"AI model call aborted (exit code {exit_code})")
+        self.exit_code = exit_code
+
+# All provider coroutines run on one long-lived event loop in a background thread,
+# so sync callers (CLI, worker threads) and async callers share the same loop.
+_loop = None
+_loop_lock = threading.Lock()
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared connector event loop, starting it on first use"""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="ai-connectors-loop", daemon=True).start()
+    return _loop
+
+def run_async(coro: Awaitable) -> concurrent.futures.Future:
+    """Start a coroutine on the shared connector loop without waiting; collect it with wait_result"""
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop())
+
+def wait_result(future: concurrent.futures.Future) -> Any:
+    """Block until a run_async future finishes and return its result"""
+    try:
+        return future.result()
+    except ModelCallAborted as e:
+        sys.exit(e.exit_code)
+
+def run_sync(coro: Awaitable) -> Any:
+    """Run a coroutine on the shared connector loop and block until it finishes"""
+    return wait_result(run_async(coro))
+
+async def aembed_text(text: str) -> Optional[List[float]]:
+    """Embed text for the semantic cache. Returns None if embeddings are unavailable"""
+    if openai is None or not OPENAI_API_KEY:
+        return None
+    try:
+        response = await _get_openai_client().embeddings.create(model=EMBEDDING_MODEL, input=text)
+        return response.data[0].embedding
+    except Exception as e:
+        print(f"Embedding failed, skipping semantic cache: {str(e)}")
+        return None
+
+async def collect_stream(stream: AsyncIterator[str]) -> str:
+    """Buffer a streamed response into the full text"""
+    return "".join([chunk async for chunk in stream])
+
+async def astream_openai_gpt(
+    prompt: str,
+    usage_info: Dict,
+    model_name: str = "gpt-3.5-turbo",
+    prompt_cache_key: Optional[str] = None,
+    json_mode: bool = False
+) -> AsyncIterator[str]:
+    """
+    Streams the OpenAI ChatCompletion response text as it arrives.
+    usage_info is filled in when the stream ends; ttfb_seconds is the time to the first token.
+    prompt_cache_key groups requests sharing a long prompt prefix so OpenAI's prompt cache can serve it.
+    json_mode makes the API return a single valid JSON object (the prompt must mention JSON).
+    """
+    # Start timing
+    start_time = time.time()
+    ttfb = None
+    
+    extra = {"prompt_cache_key": prompt_cache_key} if prompt_cache_key and OPENAI_PROMPT_CACHE_KEY else {}
+    if json_mode:
+        extra["response_format"] = {"type": "json_object"}
+    stream = await _get_openai_client().chat.completions.create(
+        model=model_name,
+        messages=[
+            {"role": "system", "content": "You are a helpful AI participant in a meeting."},
+            {"role": "user", "content": prompt},
+        ],
+        temperature=0.7,
+        stream=True,
+        stream_options={"include_usage": True},
+        **extra
+    )
+    async for chunk in stream:
+        if chunk.choices:
+            text = chunk.choices[0].delta.content
+            if text:
+                if ttfb is None:
+                    ttfb = time.time() - start_time
+                yield text
+        # The final chunk carries the usage totals
+        if chunk.usage:
+            usage_info.update({
+                "prompt_tokens": chunk.usage.prompt_tokens,
+                "completion_tokens": chunk.usage.completion_tokens,
+                "total_tokens": chunk.usage.total_tokens,
+            })
+    
+    usage_info["ttfb_seconds"] = round(ttfb if ttfb is not None else time.time() - start_time, 3)
+
+async def acall_openai_gpt(
+    prompt: str,
+    model_name: str = "gpt-3.5-turbo",
+    prompt_cache_key: Optional[str] = None,
+    json_mode: bool = False
+) -> ProviderResult:
     """
     Calls the OpenAI ChatCompletion API with a given prompt.
-    Returns (response_text, usage_info), where usage_info is a dict containing tokens used, etc.
+    Returns a ProviderResult whose usage is a dict containing tokens used, etc.
     """
     try:
-        # Start timing
-        start_time = time.time()
-        
-        # New OpenAI API format
-        response = openai.chat.completions.create(
-            model=model_name,
-            messages=[
-                {"role": "system", "content": "You are a helpful AI participant in a meeting."},
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.7
-        )
-        
-        # Calculate TTFB
-        ttfb = time.time() - start_time
-        
-        # New response format
-        text = response.choices[0].message.content
-        usage_info = {
-            "prompt_tokens": response.usage.prompt_tokens,
-            "completion_tokens": response.usage.completion_tokens,
-            "total_tokens": response.usage.total_tokens,
-            "ttfb_seconds": round(ttfb, 3)  # Round to 3 decimal places
-        }
-        return text, usage_info
+        usage_info = {}
+        text = await collect_stream(astream_openai_gpt(prompt, usage_info, model_name, prompt_cache_key, json_mode))
+        return ProviderResult(True, text, usage_info)
     except Exception as e:
         # In production, handle errors more gracefully
-        return f"[openai-gpt ERROR]: {e}", {}
+        return ProviderResult.error("openai-gpt", e)
 
-def call_claude(prompt: str) -> Tuple[str, Dict]:
+async def astream_claude(prompt: str, usage_info: Dict) -> AsyncIterator[str]:
+    """
+    Streams Anthropic's Claude response text as it arrives.
+    usage_info is filled in when the stream ends; ttfb_seconds is the time to the first token.
+    """
+    # Start timing
+    start_time = time.time()
+    ttfb = None
+    
+    async with _get_anthropic_client().messages.stream(
+        model="claude-3-sonnet-20240229",
+        max_tokens=1024,
+        messages=[
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+    ) as stream:
+        async for text in stream.text_stream:
+            if text:
+                if ttfb is None:
+                    ttfb = time.time() - start_time
+                yield text
+        response = await stream.get_final_message()
+    
+    # Build usage info
+    usage_info.update({
+        "input_tokens": response.usage.input_tokens,
+        "output_tokens": response.usage.output_tokens,
+        "total_tokens": response.usage.input_tokens + response.usage.output_tokens,
+        "ttfb_seconds": round(ttfb if ttfb is not None else time.time() - start_time, 3)
+    })
+
+async def acall_claude(prompt: str) -> ProviderResult:
     """
     Call Anthropic's Claude API.
-    Returns (response_text, usage_info).
+    Returns a ProviderResult.
     """
     try:
-        # Start timing
-        start_time = time.time()
-        
-        # Create Claude client
-        client = anthropic.Anthropic(
-            api_key=ANTHROPIC_API_KEY
-        )
-        
-        # Make the API call
-        response = client.messages.create(
-            model="claude-3-sonnet-20240229",
-            max_tokens=1024,
-            messages=[
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ]
-        )
-        
-        # Calculate TTFB
-        ttfb = time.time() - start_time
-        
-        # Extract response text
-        text = response.content[0].text
-        
-        # Build usage info
-        usage_info = {
-            "input_tokens": response.usage.input_tokens,
-            "output_tokens": response.usage.output_tokens,
-            "total_tokens": response.usage.input_tokens + response.usage.output_tokens,
-            "ttfb_seconds": round(ttfb, 3)
-        }
-        
-        return text, usage_info
+        usage_info = {}
+        text = await collect_stream(astream_claude(prompt, usage_info))
+        return ProviderResult(True, text, usage_info)
         
     except Exception as e:
         print(f"Claude API Error: {str(e)}")
-        return f"[claude ERROR]: {str(e)}", {
-            "error": str(e),
-            "ttfb_seconds": 0
+        return ProviderResult.error("claude", e)
+
+# Batch APIs trade latency (results within 24h) for half-price, high-throughput bulk runs
+BATCH_POLL_SECONDS = 30
+
+async def acall_openai_gpt_batch(prompts: List[str], model_name: str = "gpt-3.5-turbo") -> List[ProviderResult]:
+    """
+    Runs prompts through the OpenAI Batch API and waits for the batch to finish.
+    Returns one ProviderResult per prompt, in order.
+    """
+    client = _get_openai_client()
+    lines = [
+        json_dumps({
+            "custom_id": str(i),
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": model_name,
+                "messages": [
+                    {"role": "system", "content": "You are a helpful AI participant in a meeting."},
+                    {"role": "user", "content": prompt},
+                ],
+                "temperature": 0.7,
+            },
+        })
+        for i, prompt in enumerate(prompts)
+    ]
+    batch_file = await client.files.create(file=("batch.jsonl", "\n".join(lines).encode("utf-8")), purpose="batch")
+    batch = await client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    print(f"Submitted OpenAI batch {batch.id} with {len(prompts)} prompts")
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        await asyncio.sleep(BATCH_POLL_SECONDS)
+        batch = await client.batches.retrieve(batch.id)
+    if batch.status != "completed":
+        raise RuntimeError(f"OpenAI batch {batch.id} ended with status {batch.status}")
+
+    results = [ProviderResult.error("openai-gpt", "missing batch result")] * len(prompts)
+    if batch.output_file_id:
+        output = await client.files.content(batch.output_file_id)
+        for line in output.text.splitlines():
+            item = json_loads(line)
+            response = item.get("response") or {}
+            if item.get("error") or response.get("status_code") != 200:
+                error = str(item.get("error") or response.get("body"))
+                results[int(item["custom_id"])] = ProviderResult.error("openai-gpt", error)
+                continue
+            body = response["body"]
+            results[int(item["custom_id"])] = ProviderResult(True, body["choices"][0]["message"]["content"], {
+                "prompt_tokens": body["usage"]["prompt_tokens"],
+                "completion_tokens": body["usage"]["completion_tokens"],
+                "total_tokens": body["usage"]["total_tokens"],
+                "batch_id": batch.id,
+            })
+    return results
+
+async def acall_claude_batch(prompts: List[str]) -> List[ProviderResult]:
+    """
+    Runs prompts through Anthropic's Message Batches API and waits for the batch to finish.
+    Returns one ProviderResult per prompt, in order.
+    """
+    client = _get_anthropic_client()
+    batch = await client.messages.batches.create(requests=[
+        {
+            "custom_id": str(i),
+            "params": {
+                "model": "claude-3-sonnet-20240229",
+                "max_tokens": 1024,
+                "messages": [{"role": "user", "content": prompt}],
+            },
         }
+        for i, prompt in enumerate(prompts)
+    ])
+    print(f"Submitted Claude batch {batch.id} with {len(prompts)} prompts")
+    while batch.processing_status != "ended":
+        await asyncio.sleep(BATCH_POLL_SECONDS)
+        batch = await client.messages.batches.retrieve(batch.id)
+
+    results = [ProviderResult.error("claude", "missing batch result")] * len(prompts)
+    async for item in await client.messages.batches.results(batch.id):
+        if item.result.type != "succeeded":
+            error = str(getattr(item.result, "error", item.result.type))
+            results[int(item.custom_id)] = ProviderResult.error("claude", error)
+            continue
+        message = item.result.message
+        results[int(item.custom_id)] = ProviderResult(True, message.content[0].text, {
+            "input_tokens": message.usage.input_tokens,
+            "output_tokens": message.usage.output_tokens,
+            "total_tokens": message.usage.input_tokens + message.usage.output_tokens,
+            "batch_id": batch.id,
+        })
+    return results
 
-def call_gemini(prompt: str) -> Tuple[str, Dict]:
+async def acall_gemini(prompt: str) -> ProviderResult:
     """
     Call Google's Gemini API.
-    Returns (response_text, usage_info).
+    Returns a ProviderResult.
     """
     try:
         # Start timing
         start_time = time.time()
         
-        # Configure Gemini
-        genai.configure(api_key=GOOGLE_API_KEY)
-        
-        # Initialize model
-        model = genai.GenerativeModel('gemini-pro')
-        
         # Make the API call
-        response = model.generate_content(prompt)
+        response = await _get_gemini_model().generate_content_async(prompt)
         
         # Calculate TTFB
         ttfb = time.time() - start_time
@@ -185,19 +488,16 @@ def call_gemini(prompt: str) -> Tuple[str, Dict]:
             "ttfb_seconds": round(ttfb, 3)
         }
         
-        return text, usage_info
+        return ProviderResult(True, text, usage_info)
         
     except Exception as e:
         print(f"Gemini API Error: {str(e)}")
-        return f"[gemini ERROR]: {str(e)}", {
-            "error": str(e),
-            "ttfb_seconds": 0
-        }
+        return ProviderResult.error("gemini", e)
 
-def call_deepseek(prompt: str) -> Tuple[str, Dict]:
+async def acall_deepseek(prompt: str) -> ProviderResult:
     """
     Call DeepSeek's API.
-    Returns (response_text, usage_info).
+    Returns a ProviderResult.
     """
     try:
         # Start timing
@@ -222,12 +522,12 @@ def call_deepseek(prompt: str) -> Tuple[str, Dict]:
             "max_tokens": 1024
         }
         
-        # Make the API call using requests
-        import requests
-        response = requests.post(
+        # Make the API call
+        response = await _get_http_client().post(
             "https://api.deepseek.com/v1/chat/completions",
-            json=payload,
-            headers=headers
+            content=json_dumps(payload),
+            headers=headers,
+            timeout=DEEPSEEK_TIMEOUT
         )
         
         # Calculate TTFB
@@ -235,7 +535,7 @@ def call_deepseek(prompt: str) -> Tuple[str, Dict]:
         
         # Handle response
         if response.status_code == 200:
-            data = response.json()
+            data = json_loads(response.content)
             text = data['choices'][0]['message']['content']
             
             # Build usage info
@@ -246,75 +546,193 @@ def call_deepseek(prompt: str) -> Tuple[str, Dict]:
                 "ttfb_seconds": round(ttfb, 3)
             }
             
-            return text, usage_info
+            return ProviderResult(True, text, usage_info)
         else:
             raise Exception(f"API returned status code {response.status_code}: {response.text}")
             
     except Exception as e:
         print(f"DeepSeek API Error: {str(e)}")
-        return f"[deepseek ERROR]: {str(e)}", {
-            "error": str(e),
-            "ttfb_seconds": 0
-        }
+        return ProviderResult.error("deepseek", e)
 
-def call_ollama(prompt: str) -> Tuple[str, Dict]:
+async def astream_ollama(prompt: str, usage_info: Dict) -> AsyncIterator[str]:
     """
-    Call local Ollama instance.
-    Returns (response_text, usage_info).
+    Streams the local Ollama response as it is generated, parsing the NDJSON body line by line.
+    usage_info is filled in from the final (done) line; ttfb_seconds is the time to the first token.
     """
+    # Start timing
+    start_time = time.time()
+    ttfb = None
+    completion_chars = 0
+    
+    # Prepare the request payload
+    payload = {
+        "model": OLLAMA_MODEL,
+        "prompt": prompt,
+        "stream": True,
+        "options": {
+            "temperature": 0.7,
+            "num_predict": 1024,
+        }
+    }
+    
+    print(f"\nTrying to connect to Ollama at: {OLLAMA_API_BASE}")
+    print(f"Using model: {OLLAMA_MODEL}")
+    
+    # Make the API call with timeout (the read timeout applies between streamed lines)
     try:
+        async with _get_http_client().stream(
+            "POST",
+            f"{OLLAMA_API_BASE}/api/generate",
+            content=json_dumps(payload),
+            headers={"Content-Type": "application/json"},
+            timeout=OLLAMA_TIMEOUT
+        ) as response:
+            if response.status_code != 200:
+                await response.aread()
+                raise Exception(f"API returned status code {response.status_code}: {response.text}")
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                data = json_loads(line)
+                text = data.get('response', '')
+                if text:
+                    if ttfb is None:
+                        ttfb = time.time() - start_time
+                    completion_chars += len(text)
+                    yield text
+                if data.get('done'):
+                    # Build usage info (Ollama provides different metrics)
+                    usage_info.update({
+                        "eval_count": data.get('eval_count', 0),
+                        "eval_duration": data.get('eval_duration', 0),
+                        "load_duration": data.get('load_duration', 0),
+                    })
+    except httpx.TimeoutException:
+        raise Exception("Ollama API request timed out after 10 seconds. Is Ollama running?")
+    except httpx.ConnectError:
+        raise Exception(f"Could not connect to Ollama at {OLLAMA_API_BASE}. Is Ollama running?")
+    
+    usage_info.update({
+        "prompt_chars": len(prompt),
+        "completion_chars": completion_chars,
+        "total_chars": len(prompt) + completion_chars,
+        "ttfb_seconds": round(ttfb if ttfb is not None else time.time() - start_time, 3)
+    })
+
+# Micro-batching of concurrent Ollama prompts (0 ms window disables it)
+OLLAMA_BATCH_WINDOW_MS = int(os.getenv("OLLAMA_BATCH_WINDOW_MS", "0"))
+OLLAMA_BATCH_MAX = int(os.getenv("OLLAMA_BATCH_MAX", "16"))
+
+class OllamaBatcher:
+    """
+    Collects Ollama prompts that arrive within a short window and sends them as one batched
+    request to the OpenAI-compatible /v1/completions endpoint (a list of prompts, as served by
+    vLLM), so one generation pass serves them all. A prompt arriving alone is streamed as usual.
+    If the endpoint rejects a batch, batching is switched off and prompts are sent one by one.
+    Concurrent prompts only reach the batcher if OLLAMA_MAX_CONC allows them in flight.
+    """
+    def __init__(self, window_ms: int, max_batch: int):
+        self.window = window_ms / 1000
+        self.max_batch = max(1, max_batch)
+        self.enabled = True
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None  # Kept so the task is not garbage collected
+
+    async def submit(self, prompt: str) -> ProviderResult:
+        """Queue prompt for the next batch and wait for its result"""
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        # Started on first use, and again if it ever stopped (queued prompts would otherwise wait forever)
+        if self._worker is None or self._worker.done():
+            if self._worker is not None and not self._worker.cancelled() and self._worker.exception():
+                print(f"Ollama batch worker stopped ({self._worker.exception()}), restarting it")
+            self._worker = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((prompt, future))
+        return await future
+
+    async def _run(self):
+        """Background worker: wait for a prompt, give others the window to join, send the batch"""
+        while True:
+            items = [await self._queue.get()]
+            await asyncio.sleep(self.window)
+            while len(items) < self.max_batch and not self._queue.empty():
+                items.append(self._queue.get_nowait())
+            # Callers that gave up (e.g. timed out) while queued are dropped
+            items = [(prompt, future) for prompt, future in items if not future.done()]
+            if len(items) == 1 or not self.enabled:
+                await asyncio.gather(*(self._send_single(prompt, future) for prompt, future in items))
+            elif items:
+                await self._send_batch(items)
+
+    async def _send_single(self, prompt: str, future: asyncio.Future):
+        result = await _acall_ollama_single(prompt)
+        if not future.done():
+            future.set_result(result)
+
+    async def _send_batch(self, items: List[Tuple[str, asyncio.Future]]):
+        prompts = [prompt for prompt, _ in items]
+        print(f"\nSending batch of {len(prompts)} prompts to Ollama at: {OLLAMA_API_BASE}")
+        
         # Start timing
         start_time = time.time()
-        
-        # Prepare the request payload
-        payload = {
-            "model": OLLAMA_MODEL,
-            "prompt": prompt,
-            "stream": False,
-            "options": {
-                "temperature": 0.7,
-                "num_predict": 1024,
-            }
-        }
-        
-        print(f"\nTrying to connect to Ollama at: {OLLAMA_API_BASE}")
-        print(f"Using model: {OLLAMA_MODEL}")
-        
-        # Make the API call using requests with timeout
-        import requests
         try:
-            response = requests.post(
-                f"{OLLAMA_API_BASE}/api/generate",
-                json=payload,
-                timeout=10  # Add 10 second timeout
+            response = await _get_http_client().post(
+                f"{OLLAMA_API_BASE}/v1/completions",
+                content=json_dumps({
+                    "model": OLLAMA_MODEL,
+                    "prompt": prompts,
+                    "temperature": 0.7,
+                    "max_tokens": 1024,
+                }),
+                headers={"Content-Type": "application/json"},
+                timeout=OLLAMA_BATCH_TIMEOUT
             )
-        except requests.exceptions.Timeout:
-            raise Exception("Ollama API request timed out after 10 seconds. Is Ollama running?")
-        except requests.exceptions.ConnectionError:
-            raise Exception(f"Could not connect to Ollama at {OLLAMA_API_BASE}. Is Ollama running?")
+            if response.status_code != 200:
+                self.enabled = False
+                raise Exception(f"API returned status code {response.status_code}: {response.text}")
+            texts = [None] * len(prompts)
+            for choice in json_loads(response.content)['choices']:
+                texts[choice['index']] = choice['text']
+            if None in texts:
+                self.enabled = False
+                raise Exception("batched response is missing completions")
+        except Exception as e:
+            if isinstance(e, httpx.TimeoutException):
+                # Too slow to batch on this server; later requests go one by one
+                self.enabled = False
+            print(f"Ollama batch request failed ({str(e)}), sending prompts one by one")
+            await asyncio.gather(*(self._send_single(prompt, future) for prompt, future in items))
+            return
         
-        # Calculate TTFB
         ttfb = time.time() - start_time
-        
-        # Handle response
-        if response.status_code == 200:
-            data = response.json()
-            text = data['response']
-            
-            # Build usage info (Ollama provides different metrics)
-            usage_info = {
-                "eval_count": data.get('eval_count', 0),
-                "eval_duration": data.get('eval_duration', 0),
-                "load_duration": data.get('load_duration', 0),
-                "prompt_chars": len(prompt),
-                "completion_chars": len(text),
-                "total_chars": len(prompt) + len(text),
-                "ttfb_seconds": round(ttfb, 3)
-            }
-            
-            return text, usage_info
-        else:
-            raise Exception(f"API returned status code {response.status_code}: {response.text}")
+        for (prompt, future), text in zip(items, texts):
+            if not future.done():
+                future.set_result(ProviderResult(True, text, {
+                    "prompt_chars": len(prompt),
+                    "completion_chars": len(text),
+                    "total_chars": len(prompt) + len(text),
+                    "batch_size": len(items),
+                    "ttfb_seconds": round(ttfb, 3)
+                }))
+
+_ollama_batcher = OllamaBatcher(OLLAMA_BATCH_WINDOW_MS, OLLAMA_BATCH_MAX) if OLLAMA_BATCH_WINDOW_MS > 0 else None
+
+async def acall_ollama(prompt: str) -> ProviderResult:
+    """
+    Call local Ollama instance, through the micro-batcher when OLLAMA_BATCH_WINDOW_MS is set.
+    Returns a ProviderResult.
+    """
+    if _ollama_batcher is not None and _ollama_batcher.enabled:
+        return await _ollama_batcher.submit(prompt)
+    return await _acall_ollama_single(prompt)
+
+async def _acall_ollama_single(prompt: str) -> ProviderResult:
+    """Streams one Ollama response and returns it as a ProviderResult"""
+    try:
+        usage_info = {}
+        text = await collect_stream(astream_ollama(prompt, usage_info))
+        return ProviderResult(True, text, usage_info)
             
     except Exception as e:
         print(f"\nOllama API Error Details:")
@@ -326,103 +744,231 @@ def call_ollama(prompt: str) -> Tuple[str, Dict]:
         print(f"  3. Check if model '{OLLAMA_MODEL}' is pulled (run 'ollama pull {OLLAMA_MODEL}')")
         print(f"  4. Verify API base URL: {OLLAMA_API_BASE}")
         
-        return f"[ollama ERROR]: {str(e)}", {
-            "error": str(e),
-            "ttfb_seconds": 0
-        }
+        return ProviderResult.error("ollama", e)
+
+# Provider dispatch table: model name -> async provider call
+PROVIDERS: Dict[str, Callable[..., Awaitable[ProviderResult]]] = {
+    "openai-gpt": acall_openai_gpt,
+    "claude": acall_claude,
+    "gemini": acall_gemini,
+    "deepseek": acall_deepseek,
+    "ollama": acall_ollama,
+}
 
-def _make_api_call(model_name: str, prompt_content: str) -> Tuple[str, Dict[str, Any]]:
-    """Make the actual API call based on model"""
-    if model_name == "openai-gpt":
-        return call_openai_gpt(prompt_content)
-    elif model_name == "claude":
-        return call_claude(prompt_content)
-    elif model_name == "gemini":
-        return call_gemini(prompt_content)
-    elif model_name == "deepseek":
-        return call_deepseek(prompt_content)
-    elif model_name == "ollama":
-        return call_ollama(prompt_content)
+# Providers that can stream response text as it is generated
+STREAMING_PROVIDERS: Dict[str, Callable[[str, Dict], AsyncIterator[str]]] = {
+    "openai-gpt": astream_openai_gpt,
+    "claude": astream_claude,
+    "ollama": astream_ollama,
+}
+
+def _generation_span(model_name: str):
+    """Tracing span for one provider call, or a no-op context when OpenTelemetry is not installed"""
+    return tracer.start_as_current_span(f"{model_name}.generate") if tracer else nullcontext()
+
+def _record_generation(span, model_name: str, prompt: str, result: "ProviderResult", queue_wait: float, elapsed: float):
+    """
+    Attach timing to a generation span: queue wait (rate limiter), total time and, for
+    streaming providers, time to first token and time per output token after it.
+    """
+    if span is None:
+        return
+    span.set_attribute("llm.model", model_name)
+    span.set_attribute("llm.prompt_chars", len(prompt))
+    span.set_attribute("llm.ok", result.ok)
+    span.set_attribute("queue_wait_ms", queue_wait * 1000)
+    span.set_attribute("total_ms", elapsed * 1000)
+    usage = result.usage
+    output_tokens = usage.get('completion_tokens') or usage.get('output_tokens') or usage.get('eval_count')
+    if output_tokens:
+        span.set_attribute("llm.output_tokens", output_tokens)
+    # Only streamed responses measure the first token; for the others ttfb is the whole call
+    if model_name in STREAMING_PROVIDERS and result.ok and 'ttfb_seconds' in usage:
+        ttft = usage['ttfb_seconds']
+        span.set_attribute("ttft_ms", ttft * 1000)
+        if output_tokens:
+            span.set_attribute("tpot_ms", max(elapsed - ttft, 0) * 1000 / output_tokens)
+
+# Identical requests currently on the wire, keyed by (cache model, prompt)
+_inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+
+async def _coalesced(key: Tuple[str, str], make_call: Callable[[], Awaitable[ProviderResult]]) -> ProviderResult:
+    """
+    Run make_call() unless an identical request is already in flight, in which case
+    wait for that one instead of sending a duplicate. Followers get their own usage copy.
+    """
+    while (pending := _inflight.get(key)) is not None:
+        print("Waiting for identical in-flight request...")
+        try:
+            result = await asyncio.shield(pending)
+        except asyncio.CancelledError:
+            # The leader was cancelled (e.g. a losing speculative reply), not this task:
+            # make the call itself, or follow whichever identical request took over
+            if pending.cancelled() and not asyncio.current_task().cancelling():
+                continue
+            raise
+        return ProviderResult(result.ok, result.text, dict(result.usage))
+    
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        result = await make_call()
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except BaseException as e:
+        future.set_exception(e)
+        future.exception()  # Mark retrieved; followers still receive it when awaiting
+        raise
     else:
-        raise ValueError(f"Unknown model: {model_name}")
+        future.set_result(result)
+        return result
+    finally:
+        _inflight.pop(key, None)
 
-def call_ai_model(model_name: str, prompt_content: str) -> Tuple[str, Dict[str, Any]]:
+async def acall_ai_model(
+    model_name: str,
+    prompt_content: str,
+    options: Optional[Dict[str, Any]] = None,
+    semantic_key: Optional[Tuple[str, str]] = None,
+    refresh: bool = False
+) -> Tuple[str, Dict[str, Any]]:
     """
-    Generic function to call different AI models based on model_name.
+    Async version of call_ai_model. Dispatches to the provider coroutine for model_name.
+    options are passed to the provider as keyword arguments (e.g. model_name, prompt_cache_key).
+    semantic_key=(template_id, text) makes the semantic cache compare only text (e.g. the topic)
+    among prompts built from the same template. Without it the semantic cache is not used: whole
+    meeting prompts differ by a line or a speaker name, and a near-duplicate's answer would be wrong.
+    refresh=True skips the cached response (e.g. one that could not be parsed) and asks the model again.
     Returns (response_text, usage_info)
     """
     validate_api_keys(model_name)
+    try:
+        provider = PROVIDERS[model_name]
+    except KeyError:
+        raise ValueError(f"Unknown model: {model_name}")
+    options = options or {}
+    # A provider-specific model changes the response, so it is part of the cache namespace
+    cache_model = f"{model_name}:{options['model_name']}" if 'model_name' in options else model_name
     
     # Get retry config from env
     max_retries = int(os.getenv("AUTOMATIC_RETRY_ON_ERROR", "0"))
     RETRY_DELAY = 3  # seconds between retries
     retry_count = 0
+    semantic = get_semantic_cache() if semantic_key else None
+    semantic_lookup = not refresh
+    embedding = None
+    if semantic is not None:
+        semantic_namespace, semantic_text = f"{cache_model}:{semantic_key[0]}", semantic_key[1]
+    
+    # Create prompt dict with content and model info
+    prompt = {
+        'content': prompt_content,
+        'model': model_name
+    }
+    
+    # Always show prompt debug first (once, retries reuse the approval)
+    print(f"\nSending prompt to {model_name} API...")
+    try:
+        proceed = debug_prompt(prompt)
+    except SystemExit as e:
+        raise ModelCallAborted(e.code or 0)
+    if not proceed:
+        print("User chose not to proceed with prompt")
+        raise ModelCallAborted(0)
     
+    cache_manager = get_cache()
+    if refresh and cache_manager is not None:
+        cache_manager.delete(prompt_content, cache_model)
+    if refresh and semantic is not None:
+        # The rejected response may have been stored for this prompt, or served from a near-duplicate's row
+        semantic.delete(semantic_namespace, prompt_content)
+        embedding = await aembed_text(semantic_text)
+        near_prompt = semantic.nearest_prompt(embedding, semantic_namespace) if embedding else None
+        if near_prompt is not None:
+            semantic.delete(semantic_namespace, near_prompt)
     while True:
         try:
-            # Create prompt dict with content and model info
-            prompt = {
-                'content': prompt_content,
-                'model': model_name
-            }
-            
-            # Always show prompt debug first
-            print(f"\nSending prompt to {model_name} API...")
-            proceed = debug_prompt(prompt)
-            if not proceed:
-                print("User chose not to proceed with prompt")
-                sys.exit(0)
-            
             # Check cache after prompt is approved
             if cache_manager is not None:
                 print(f"\nChecking cache for {model_name} response...")
-                cached = cache_manager.get(prompt_content, model_name)
+                cached = cache_manager.get(prompt_content, cache_model)
                 if cached:
                     response_text, usage_info = cached
                     usage_info['model'] = model_name
                     print(f"✓ Found cached response from {model_name}")
                     print(f"Usage Info (cached): {usage_info}")
-                    proceed, retry = debug_response(prompt, (response_text, usage_info))
+                    try:
+                        proceed, retry = debug_response(prompt, (response_text, usage_info))
+                    except SystemExit as e:
+                        raise ModelCallAborted(e.code or 0)
                     if retry:
-                        cache_manager.delete(prompt_content, model_name)
+                        cache_manager.delete(prompt_content, cache_model)
                         print("Cleared cached response for retry")
-                        return call_ai_model(model_name, prompt_content)
+                        # A retry asks for a fresh response, so near-duplicates must not answer either
+                        semantic_lookup = False
+                        continue
                     elif not proceed:
                         print("User rejected cached response")
-                        sys.exit(0)
+                        raise ModelCallAborted(0)
                     return response_text, usage_info
                 print("✗ No cached response found")
             
+            # Exact match missed - reuse the response to a near-identical prompt if there is one
+            if semantic is not None:
+                if embedding is None:
+                    embedding = await aembed_text(semantic_text)
+                hit = semantic.lookup(embedding, semantic_namespace) if embedding and semantic_lookup else None
+                if hit:
+                    response_text, usage_info, similarity = hit
+                    usage_info['model'] = model_name
+                    print(f"✓ Found semantically similar cached response from {model_name} (similarity {similarity:.3f})")
+                    return response_text, usage_info
+            
             print(f"Making API call to {model_name}...")
             # Get timeout from env
             api_timeout = int(os.getenv("API_CALL_TIMEOUT", "33"))
             
+            async def limited_call():
+                with _generation_span(model_name) as span:
+                    # Hold a concurrency slot and a rate-limit token for this provider,
+                    # then make the API call with timeout (0 disables it)
+                    queued_at = time.perf_counter()
+                    limiter = get_rate_limiter(model_name)
+                    async with limiter:
+                        await limiter.acquire_token()
+                        started_at = time.perf_counter()
+                        result = await call_with_timeout(
+                            provider(prompt_content, **options),
+                            timeout=api_timeout,
+                            model_name=model_name
+                        )
+                    _record_generation(span, model_name, prompt_content, result,
+                                       started_at - queued_at, time.perf_counter() - started_at)
+                    return result
+            
             try:
-                # Make the API call with timeout
-                response_text, usage_info = call_with_timeout(
-                    _make_api_call,
-                    model_name, 
-                    prompt_content,
-                    timeout=api_timeout,
-                    model_name=model_name
-                )
+                result = await _coalesced((cache_model, prompt_content), limited_call)
+                response_text, usage_info = result.text, result.usage
                 
                 # Check for API errors
-                if "[ERROR]" in response_text or usage_info.get('error'):
+                if not result.ok:
                     if retry_count < max_retries:
                         retry_count += 1
                         print(f"\nError from {model_name}. Waiting {RETRY_DELAY}s before retry...")
                         print(f"Retrying... (Attempt {retry_count} of {max_retries})")
-                        time.sleep(RETRY_DELAY)
+                        await asyncio.sleep(RETRY_DELAY)
                         continue
                     else:
                         print(f"\nFATAL ERROR: {model_name} failed after {max_retries} retry attempts")
                         print("Error details:", response_text)
-                        sys.exit(1)
+                        raise ModelCallAborted(1)
                 
                 # Success - cache and return
                 if cache_manager:
-                    cache_manager.set(prompt_content, model_name, response_text, usage_info)
+                    cache_manager.set(prompt_content, cache_model, response_text, usage_info)
+                if semantic is not None and embedding:
+                    semantic.add(embedding, semantic_namespace, prompt_content, response_text, usage_info)
                 
                 return response_text, usage_info
                 
@@ -431,26 +977,121 @@ def call_ai_model(model_name: str, prompt_content: str) -> Tuple[str, Dict[str,
                     retry_count += 1
                     print(f"\nTimeout from {model_name}. Waiting {RETRY_DELAY}s before retry...")
                     print(f"Retrying... (Attempt {retry_count} of {max_retries})")
-                    time.sleep(RETRY_DELAY)
+                    await asyncio.sleep(RETRY_DELAY)
                     continue
                 else:
                     print(f"\nFATAL ERROR: {model_name} timed out after {max_retries} retry attempts")
-                    sys.exit(1)
+                    raise ModelCallAborted(1)
                     
+        except ModelCallAborted:
+            raise
         except Exception as e:
             if retry_count < max_retries:
                 retry_count += 1
                 print(f"\nUnexpected error from {model_name}: {str(e)}")
                 print(f"Waiting {RETRY_DELAY}s before retry...")
                 print(f"Retrying... (Attempt {retry_count} of {max_retries})")
-                time.sleep(RETRY_DELAY)
+                await asyncio.sleep(RETRY_DELAY)
                 continue
             else:
                 print(f"\nFATAL ERROR: {model_name} failed after {max_retries} retry attempts")
                 print(f"Error details: {str(e)}")
-                sys.exit(1)
+                raise ModelCallAborted(1)
 
-def decide_next_speaker(
+# Providers with a bulk Batch API, and the smallest batch worth submitting to one
+BATCH_API_PROVIDERS: Dict[str, Callable[[List[str]], Awaitable[List[ProviderResult]]]] = {
+    "openai-gpt": acall_openai_gpt_batch,
+    "claude": acall_claude_batch,
+}
+BATCH_API_MIN_SIZE = 50
+
+class BatchProcessor:
+    """
+    Runs many prompts against one model concurrently.
+    Concurrency and request rate are bounded by the model's RateLimiter.
+    With use_batch_api=True, large batches for providers with a Batch API are submitted
+    as one bulk job instead (no prompt/response debugging; results are cached).
+    """
+    def __init__(self, use_batch_api: bool = False):
+        self.use_batch_api = use_batch_api
+
+    async def run_batch(self, model_name: str, prompts: List[str]) -> List[Union[Tuple[str, Dict[str, Any]], BaseException]]:
+        """
+        Returns one (response_text, usage_info) or exception per prompt, in order.
+        A Batch API item that failed comes back as a RuntimeError carrying its error text.
+        """
+        if self.use_batch_api and model_name in BATCH_API_PROVIDERS and len(prompts) >= BATCH_API_MIN_SIZE:
+            validate_api_keys(model_name)
+            results = await BATCH_API_PROVIDERS[model_name](prompts)
+            cache_manager = get_cache()
+            if cache_manager:
+                for prompt, result in zip(prompts, results):
+                    if result.ok:
+                        cache_manager.set(prompt, model_name, result.text, result.usage)
+            return [(result.text, result.usage) if result.ok else RuntimeError(result.text) for result in results]
+        return await asyncio.gather(
+            *(acall_ai_model(model_name, prompt) for prompt in prompts),
+            return_exceptions=True
+        )
+
+def call_ai_model(model_name: str, prompt_content: str) -> Tuple[str, Dict[str, Any]]:
+    """
+    Generic function to call different AI models based on model_name.
+    Thin sync wrapper around acall_ai_model for callers that are not async.
+    Returns (response_text, usage_info)
+    """
+    return run_sync(acall_ai_model(model_name, prompt_content))
+
+# The manager only picks a name, so a small, fast OpenAI model is used for it when OpenAI is
+# configured, whatever the manager model set for the meeting (empty value disables this)
+OPENAI_MANAGER_MODEL = os.getenv("OPENAI_MANAGER_MODEL", "gpt-4o-mini")
+
+# Manager prompt: everything that stays the same across turns comes first and the
+# conversation last, so consecutive calls share a long prefix that providers can
+# serve from their prompt cache
+_DECIDE_TEMPLATE = (
+    "You are the 'group chat manager', also the 'logkeeper' of the meeting.\n"
+    "This is the meeting setup data in JSON format:\n"
+    "----------------------\n"
+    "{setup}\n"
+    "----------------------\n"
+    "Available characters: {names}\n"
+    "For the most entertaining and logical outcome, \n"
+    "which single character from the list of Available characters should speak next? Return just the name of the character (no explanation)\n"
+    "Here is the conversation so far:\n"
+    "----------------------\n"
+    "{conv}\n"
+    "----------------------\n"
+)
+
+# Last setup_data serialized for the manager prompt, as (setup_data, json)
+_setup_json_cache: Optional[Tuple[dict, str]] = None
+
+def _setup_json(setup_data: dict) -> str:
+    """
+    Compact JSON for setup_data: fewer prompt tokens, and identical across turns for prefix caching.
+    The setup does not change during a meeting, so the last result is reused while it is equal
+    (a dict comparison is much cheaper than serializing again). setup_data is treated as read-only.
+    """
+    global _setup_json_cache
+    # ConversationManager passes the same dict every turn, so the identity check usually settles it
+    if _setup_json_cache is None or (_setup_json_cache[0] is not setup_data and _setup_json_cache[0] != setup_data):
+        _setup_json_cache = (setup_data, json_dumps(setup_data))
+    return _setup_json_cache[1]
+
+def _build_decide_prompt(conversation_so_far: str, character_names: list, setup_json: str) -> str:
+    """
+    Builds the manager prompt asking who should speak next.
+    conversation_so_far must already be filtered (no SystemCheck / check lines, see utils.filter_system_lines);
+    ConversationManager passes its incrementally filtered transcript.
+    """
+    return _DECIDE_TEMPLATE.format(
+        setup=setup_json,
+        names=character_names,
+        conv=conversation_so_far
+    )
+
+async def adecide_next_speaker(
     manager_model: str,
     conversation_so_far: str,
     character_names: list,
@@ -459,38 +1100,83 @@ def decide_next_speaker(
     """
     Calls the 'manager_model' to decide who should speak next.
     Now includes the full setup data for better context.
+    conversation_so_far must already be filtered of the manager's check lines.
+    Returns the manager's answer as given, which may not be one of character_names;
+    the caller decides how to handle an unknown name.
     """
-    # Filter out SystemCheck messages
-    conversation_lines = conversation_so_far.split('\n')
-    filtered_lines = [
-        line for line in conversation_lines 
-        if not line.startswith("SystemCheck:") and 
-        not "[Goal Check]" in line and 
-        not "[Closing Check]" in line
-    ]
-    filtered_conversation = '\n'.join(filtered_lines)
+    setup_json = _setup_json(setup_data)
+    prompt = _build_decide_prompt(conversation_so_far, character_names, setup_json)
 
-    prompt = (
-        "You are the 'group chat manager', also the 'logkeeper' of the meeting.\n"
-        
-        "This is the meeting setup data in JSON format:\n"
-        "----------------------\n"
-        f"{json.dumps(setup_data, indent=2)}\n"  # Pretty print the setup data
-        "----------------------\n"
-        
-        "Here is the conversation so far:\n"
-        "----------------------\n"
-        f"{filtered_conversation}\n"
-        "----------------------\n"
-        f"Available characters: {character_names}\n"
-        f"For the most entertaining and logical outcome, \n"
-        "which single character from the list of Available characters should speak next? Return just the name of the character (no explanation)"
-    )
+    options = None
+    if OPENAI_MANAGER_MODEL and openai and OPENAI_API_KEY:
+        manager_model = "openai-gpt"
+        options = {
+            "model_name": OPENAI_MANAGER_MODEL,
+            "prompt_cache_key": hashlib.sha256(setup_json.encode("utf-8")).hexdigest()[:32],
+        }
 
-    response_text, _usage = call_ai_model(manager_model, prompt)
-    chosen_name = response_text.strip()
+    response_text, _usage = await acall_ai_model(manager_model, prompt, options)
+    return response_text.strip()
 
-    if chosen_name not in character_names:
-        chosen_name = character_names[0]
+def decide_next_speaker(
+    manager_model: str,
+    conversation_so_far: str,
+    character_names: list,
+    setup_data: dict
+) -> str:
+    """Sync wrapper around adecide_next_speaker"""
+    return run_sync(adecide_next_speaker(manager_model, conversation_so_far, character_names, setup_data))
+
+def likely_next_speakers(character_names: list, last_speaker: Optional[str], top_k: int) -> list:
+    """
+    Cheap guess at who speaks next: round-robin order after the last speaker,
+    who is assumed not to speak twice in a row.
+    """
+    if last_speaker in character_names:
+        i = character_names.index(last_speaker)
+        order = character_names[i + 1:] + character_names[:i]
+    else:
+        order = list(character_names)
+    return order[:top_k]
+
+async def adecide_next_speaker_speculative(
+    manager_model: str,
+    conversation_so_far: str,
+    character_names: list,
+    setup_data: dict,
+    build_reply: Callable[[str], Tuple[str, str]],
+    last_speaker: Optional[str] = None,
+    top_k: int = 2
+) -> Tuple[str, str, Dict[str, Any]]:
+    """
+    Decides the next speaker while the replies of the top_k likeliest speakers are
+    generated in parallel, hiding the manager call's latency behind them.
+    build_reply(name) returns (model_name, prompt) for that character's reply.
+    Returns (chosen_name, reply_text, usage_info). Losing generations are cancelled;
+    any that already finished stay in the response cache.
+    """
+    candidates = likely_next_speakers(character_names, last_speaker, top_k)
+    tasks = {}
+    for name in candidates:
+        model, prompt = build_reply(name)
+        tasks[name] = asyncio.create_task(acall_ai_model(model, prompt))
+    try:
+        chosen_name = await adecide_next_speaker(manager_model, conversation_so_far, character_names, setup_data)
+        task = tasks.pop(chosen_name, None)
+        if task is not None:
+            print(f"Speculation hit: {chosen_name}")
+            reply_text, usage = await task
+        else:
+            print(f"Speculation missed: {chosen_name} not in {candidates}")
+            model, prompt = build_reply(chosen_name)
+            reply_text, usage = await acall_ai_model(model, prompt)
+    finally:
+        for task in tasks.values():
+            task.cancel()
+            # Losing results are not needed; retrieve any exception so it is not logged as unhandled
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+    return chosen_name, reply_text, usage
 
-    return chosen_name
+def decide_next_speaker_speculative(*args, **kwargs) -> Tuple[str, str, Dict[str, Any]]:
+    """Sync wrapper around adecide_next_speaker_speculative"""
+    return run_sync(adecide_next_speaker_speculative(*args, **kwargs))
@@ -4,25 +4,121 @@ Cache manager for AI responses with expiry and seeding.
 
 import json
 import os
+import logging
+import atexit
 import time
 import hashlib
-from typing import Dict, Optional, Tuple, Union
-from datetime import datetime, timedelta
+import threading
+import functools
+import queue
+import weakref
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, Union
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None  # Falls back to hashlib.sha256
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Falls back to the stdlib json module
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None  # The snapshot stays JSON
+
+log = logging.getLogger(__name__)
 
 CACHE_DIR = "cache"
+# One snapshot file per model in this subdirectory, msgpack when installed and JSON otherwise
+SHARD_DIR = "ai_responses"
+SNAPSHOT_EXT = ".msgpack" if msgpack is not None else ".json"
+# Single-file snapshots for all models written by older versions; split into shards on first load
 CACHE_FILE = "ai_responses_cache.json"
+LEGACY_MSGPACK_CACHE_FILE = "ai_responses_cache.msgpack"
+# Mutations since the last snapshots, one JSON object per line; folded into the shards on compaction
+JOURNAL_FILE = "ai_responses_cache.jsonl"
+COMPACT_EVERY = 1000  # journal lines before the snapshot is rewritten
 DEFAULT_CACHE_SEED = 69
 DEFAULT_EXPIRY_DAYS = 3
+DEFAULT_EXPIRY_SECONDS = DEFAULT_EXPIRY_DAYS * 86400
+MAX_ENTRIES = 10_000  # per model; the least recently used entries are evicted beyond this
+# Prompts memoized by _normalize_text / _hash. A prompt is looked up a few times in a row (get, miss,
+# set), and prompts can be tens of KB, so only the last few are kept rather than thousands
+MEMO_PROMPTS = 16
+
+@functools.lru_cache(maxsize=MEMO_PROMPTS)
+def _normalize_text(prompt_str: str) -> str:
+    """
+    Strip every line of prompt_str and the whole text.
+    map(str.strip) keeps the per-line loop in C; it measured several times faster
+    than a generator expression or a whitespace regex substitution.
+    """
+    return "\n".join(map(str.strip, prompt_str.split("\n"))).strip()
+
+@functools.lru_cache(maxsize=MEMO_PROMPTS)
+def _hash(normalized_prompt: str, model_name: str, cache_seed: int) -> str:
+    """
+    Hash of the normalized prompt + model + seed combination.
+    This is only a lookup key, so the non-cryptographic xxh3 is used when installed.
+    Without it sha256 is kept: on CPUs with SHA extensions it beats the other stdlib hashes.
+    Memoized for the last few prompts, since a prompt is usually hashed several times in a row (get, miss, set).
+    Both variants give a 128-bit key (32 hex chars), which keeps the cache file small.
+    """
+    hasher = xxhash.xxh3_128() if xxhash is not None else hashlib.sha256()
+    # Fed in pieces so a long prompt is not copied into a second "prompt:model:seed" string.
+    # surrogatepass so a stray lone surrogate in a prompt cannot make hashing fail
+    hasher.update(normalized_prompt.encode('utf-8', 'surrogatepass'))
+    hasher.update(f":{model_name}:{cache_seed}".encode('utf-8', 'surrogatepass'))
+    return hasher.digest()[:16].hex()
+
+def _dumps(obj) -> bytes:
+    """Compact UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def _loads(data: bytes):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _pack_snapshot(obj) -> bytes:
+    """Serialize a snapshot file (msgpack when installed)"""
+    if msgpack is not None:
+        return msgpack.packb(obj, use_bin_type=True)
+    return _dumps(obj)
+
+def _unpack_snapshot(data: bytes):
+    if msgpack is not None:
+        return msgpack.unpackb(data, raw=False)
+    return _loads(data)
 
 class CacheManager:
     def __init__(self, cache_seed: int = DEFAULT_CACHE_SEED):
         self.cache_seed = cache_seed
-        self.cache_file = os.path.join(CACHE_DIR, CACHE_FILE)
-        os.makedirs(CACHE_DIR, exist_ok=True)
-        print(f"\nInitializing cache manager with seed: {cache_seed}")
-        expired_count = self._prune_expired()
-        if expired_count > 0:
-            print(f"Pruned {expired_count} expired cache entries")
+        self.shard_dir = os.path.join(CACHE_DIR, SHARD_DIR)
+        self.journal_file = os.path.join(CACHE_DIR, JOURNAL_FILE)
+        os.makedirs(self.shard_dir, exist_ok=True)
+        log.info("Initializing cache manager with seed: %s", cache_seed)
+        # Each model's entries live in their own snapshot file, read on first use of that model.
+        # Mutations are appended to one shared journal instead of rewriting a snapshot.
+        self._lock = threading.RLock()
+        self._journal = None  # Only used by the writer thread
+        self._journal_ops = 0
+        self._shards: Dict[str, OrderedDict] = {}  # model -> entries, least recently used first
+        self._dirty = set()  # models whose snapshot file is behind the in-memory shard
+        self._migrate_single_file()
+        self._pending = self._load_journal()  # model -> journal records not yet applied to a shard
+        # Journal appends and snapshot writes run in order on one writer thread, so callers on the
+        # event loop only update memory and queue the disk work
+        self._writes = queue.SimpleQueue()
+        self._writer = threading.Thread(target=self._write_loop, name="cache-writer", daemon=True)
+        self._writer.start()
+        _instances.add(self)
     
     def _normalize_prompt(self, prompt: Union[str, Dict]) -> str:
         """Normalize the prompt for consistent hashing"""
@@ -33,153 +129,345 @@ class CacheManager:
             # If prompt is already a string, use it directly
             prompt_str = str(prompt)
         
-        return "\n".join(line.strip() for line in prompt_str.split("\n")).strip()
+        return _normalize_text(prompt_str)
     
     def _generate_hash(self, prompt: str, model_name: str) -> str:
         """Generate a unique hash for the prompt + model + seed combination"""
-        normalized_prompt = self._normalize_prompt(prompt)
-        content = f"{normalized_prompt}:{model_name}:{self.cache_seed}"
-        hash_value = hashlib.sha256(content.encode()).hexdigest()
-        print(f"Generated hash for cache: {hash_value[:8]}...")
-        return hash_value
-    
-    def _load_cache(self) -> Dict:
-        """Load the cache file or create new if not exists"""
+        return _hash(self._normalize_prompt(prompt), model_name, self.cache_seed)
+    
+    def _shard_file(self, model_name: str, ext: str = SNAPSHOT_EXT) -> str:
+        """Snapshot path for one model; the name is hashed since model names may contain ':' or '/'"""
+        digest = hashlib.blake2b(model_name.encode(), digest_size=8).hexdigest()
+        return os.path.join(self.shard_dir, digest + ext)
+    
+    def _shard(self, model_name: str) -> OrderedDict:
+        """In-memory entries for model_name, loading and pruning its snapshot on first use"""
+        with self._lock:
+            entries = self._shards.get(model_name)
+            if entries is None:
+                # Snapshots are written in LRU order, so the order survives a restart
+                self._shards[model_name] = OrderedDict(self._load_cache(model_name))
+                expired_count = self._prune_expired(model_name)
+                if expired_count > 0:
+                    log.info("Pruned %d expired cache entries for %s", expired_count, model_name)
+                entries = self._shards[model_name]
+                self._evict(model_name)
+            return entries
+    
+    def _evict(self, model_name: str):
+        """Drop the least recently used entries of a shard beyond MAX_ENTRIES"""
+        entries = self._shards[model_name]
+        while len(entries) > MAX_ENTRIES:
+            key, _ = entries.popitem(last=False)
+            # Journaled like a delete, or replaying the journal would bring the entry back
+            self._append_journal({"op": "delete", "model": model_name, "key": key})
+    
+    def _load_cache(self, model_name: str) -> Dict:
+        """Load one model's snapshot (empty if none), then apply its journaled changes on top"""
+        entries = self._load_snapshot(model_name)
+        pending = self._pending.pop(model_name, ())
+        for record in pending:
+            if record["op"] == "set":
+                entries[record["key"]] = record["entry"]
+            else:
+                entries.pop(record["key"], None)
+        # Older entries also stored the prompt and model, which the key already covers
+        stale = [entry for entry in entries.values() if "prompt" in entry]
+        for entry in stale:
+            del entry["prompt"]
+            entry.pop("model", None)
+        if pending or stale:
+            self._dirty.add(model_name)
+        return entries
+    
+    def _load_snapshot(self, model_name: str) -> Dict:
+        """Load the entries of one model's snapshot file"""
+        path = self._shard_file(model_name)
         try:
-            if os.path.exists(self.cache_file):
-                print(f"Loading existing cache from: {self.cache_file}")
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    print(f"Loaded cache with {len(data.get('entries', {}))} entries")
-                    return data
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    data = _unpack_snapshot(f.read())
+            elif SNAPSHOT_EXT != ".json" and os.path.exists(self._shard_file(model_name, ".json")):
+                # Written before msgpack was installed; rewritten as msgpack on the next compaction
+                with open(self._shard_file(model_name, ".json"), 'rb') as f:
+                    data = _loads(f.read())
+                self._dirty.add(model_name)
             else:
-                print(f"No existing cache file at: {self.cache_file}")
-                return {"cache_seed": self.cache_seed, "entries": {}}
+                log.debug("No cache file for %s", model_name)
+                return {}
+            log.debug("Loaded %d cache entries for %s", len(data["entries"]), model_name)
+            return data["entries"]
         except Exception as e:
-            print(f"Error loading cache: {str(e)}")
-            return {"cache_seed": self.cache_seed, "entries": {}}
-    
-    def _save_cache(self, cache_data: Dict):
-        """Save the cache data to file"""
-        with open(self.cache_file, 'w') as f:
-            json.dump(cache_data, f, indent=2)
-    
-    def _prune_expired(self) -> int:
-        """Remove expired entries and error responses from cache. Returns count of pruned entries."""
-        cache_data = self._load_cache()
-        current_time = datetime.now().timestamp()
-        expired_count = 0
-        
-        # Create new dict for valid entries
-        valid_entries = {}
+            log.error("Error loading cache for %s: %s", model_name, e)
+            return {}
+    
+    def _load_journal(self) -> Dict[str, List[Dict]]:
+        """Read the journal into per-model lists of records, applied when a shard is loaded"""
+        pending: Dict[str, List[Dict]] = {}
+        if os.path.exists(self.journal_file):
+            with open(self.journal_file, 'rb') as f:
+                for line in f:
+                    try:
+                        record = _loads(line)
+                    except ValueError:
+                        continue  # Partial last line from an interrupted write
+                    # Journals from the single-file cache only name the model inside set entries
+                    model_name = record.get("model") or record.get("entry", {}).get("model")
+                    if model_name is not None:
+                        pending.setdefault(model_name, []).append(record)
+                    self._journal_ops += 1
+            log.debug("Found %d journaled cache changes", self._journal_ops)
+        return pending
+    
+    def _migrate_single_file(self):
+        """Split a cache written as one file for all models (plus its journal) into per-model shards"""
+        for legacy_file in (LEGACY_MSGPACK_CACHE_FILE, CACHE_FILE):
+            path = os.path.join(CACHE_DIR, legacy_file)
+            if not os.path.exists(path) or (legacy_file.endswith(".msgpack") and msgpack is None):
+                continue
+            log.info("Splitting %s into per-model cache files", path)
+            try:
+                with open(path, 'rb') as f:
+                    data = f.read()
+                entries = (msgpack.unpackb(data, raw=False) if legacy_file.endswith(".msgpack") else _loads(data))["entries"]
+                if os.path.exists(self.journal_file):
+                    with open(self.journal_file, 'rb') as f:
+                        for line in f:
+                            try:
+                                record = _loads(line)
+                            except ValueError:
+                                continue
+                            if record["op"] == "set":
+                                entries[record["key"]] = record["entry"]
+                            else:
+                                entries.pop(record["key"], None)
+                for key, entry in entries.items():
+                    self._shards.setdefault(entry["model"], {})[key] = entry
+                for model_name, model_entries in self._shards.items():
+                    self._save_cache(model_name, model_entries)
+            except Exception as e:
+                log.error("Error migrating cache file %s: %s", path, e)
+                self._shards.clear()
+                continue
+            self._shards.clear()
+            os.remove(path)
+            if os.path.exists(self.journal_file):
+                os.remove(self.journal_file)
+    
+    def _write_loop(self):
+        """Writer thread: run the queued disk operations in order until close() sends None"""
+        while True:
+            write = self._writes.get()
+            if write is None:
+                return
+            try:
+                write()
+            except Exception as e:
+                log.exception("Error writing cache files: %s", e)
+    
+    def _append_journal(self, record: Dict):
+        """Record one mutation in the journal; compacts once the journal gets long"""
+        with self._lock:
+            self._writes.put(functools.partial(self._write_journal, _dumps(record) + b"\n"))
+            self._journal_ops += 1
+            self._dirty.add(record["model"])
+            if self._journal_ops >= COMPACT_EVERY:
+                self._compact()
+    
+    def _write_journal(self, line: bytes):
+        if self._journal is None:
+            self._journal = open(self.journal_file, 'ab')
+        self._journal.write(line)
+        self._journal.flush()
+    
+    def _compact(self):
+        """
+        Fold the journal into the per-model snapshot files and start an empty journal.
+        The dirty shards are copied here and written by the writer thread after the journal
+        lines queued before them; lines queued afterwards go to the new journal.
+        """
+        with self._lock:
+            if self._journal_ops == 0 and not self._dirty:
+                return
+            # Shards never used in this process may still have journaled changes to fold in
+            for model_name in list(self._pending):
+                self._shard(model_name)
+            snapshots = {model_name: OrderedDict(self._shards[model_name]) for model_name in self._dirty}
+            self._dirty.clear()
+            self._journal_ops = 0
+            self._writes.put(functools.partial(self._write_snapshots, snapshots))
+    
+    def _write_snapshots(self, snapshots: Dict[str, OrderedDict]):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        for model_name, entries in snapshots.items():
+            self._save_cache(model_name, entries)
+        # Replaying a journal over snapshots that already have its changes is harmless,
+        # so a crash between these two steps loses nothing
+        if os.path.exists(self.journal_file):
+            os.remove(self.journal_file)
+    
+    def close(self):
+        """Compact, wait for the writer thread to finish all queued writes, and stop it (at exit)"""
+        if not self._writer.is_alive():
+            return
+        self._compact()
+        self._writes.put(None)
+        self._writer.join()
+    
+    def _save_cache(self, model_name: str, entries: Dict):
+        """
+        Save one model's entries to its snapshot file.
+        Compact JSON (or msgpack) is written to a temp file and renamed over the cache file,
+        so a crash mid-write never leaves a truncated cache behind.
+        """
+        path = self._shard_file(model_name)
+        tmp_file = path + ".tmp"
+        data = {"cache_seed": self.cache_seed, "model": model_name, "entries": entries}
+        with open(tmp_file, 'wb', buffering=1 << 20) as f:
+            f.write(_pack_snapshot(data))
+        os.replace(tmp_file, path)
+        if SNAPSHOT_EXT != ".json":
+            json_path = self._shard_file(model_name, ".json")
+            if os.path.exists(json_path):
+                os.remove(json_path)
+    
+    def _prune_expired(self, model_name: str) -> int:
+        """
+        Remove expired entries and error responses from one model's shard. Returns count of pruned entries.
+        Works on the already loaded shard; the files are not read again.
+        """
+        entries = self._shards[model_name]
+        current_time = time.time()
         
-        for key, entry in cache_data["entries"].items():
-            # Check if entry is expired
-            is_expired = entry["expires_at"] <= current_time
-            
-            # Check if entry is an error response
+        # Keep only valid, non-expired, non-error entries; one pass, each field read once
+        valid_entries = OrderedDict()
+        for key, entry in entries.items():
+            if entry["expires_at"] <= current_time:
+                continue
+            if entry["usage_info"].get('error') is not None:
+                continue
             response_text = entry["response"]
-            usage_info = entry["usage_info"]
-            is_error = (
-                (isinstance(response_text, str) and response_text.startswith("[") and "ERROR" in response_text) or
-                usage_info.get('error') is not None
-            )
-            
-            # Keep only valid, non-expired, non-error entries
-            if not is_expired and not is_error:
-                valid_entries[key] = entry
-            else:
-                expired_count += 1
+            if type(response_text) is str and response_text[:1] == "[" and "ERROR" in response_text:
+                continue
+            valid_entries[key] = entry
+        expired_count = len(entries) - len(valid_entries)
         
         if expired_count > 0:
-            cache_data["entries"] = valid_entries
-            self._save_cache(cache_data)
+            with self._lock:
+                self._shards[model_name] = valid_entries
+                self._dirty.add(model_name)  # Rewritten on the next compaction
             
         return expired_count
     
     def get(self, prompt: str, model_name: str) -> Optional[Tuple[str, Dict]]:
         """Get cached response if exists and not expired"""
-        cache_data = self._load_cache()
         prompt_hash = self._generate_hash(prompt, model_name)
         
-        #print(f"Looking for hash {prompt_hash[:8]}... in cache")
-        #print(f"Available cache entries: {list(cache_data['entries'].keys())[:8]}")
-        
-        if prompt_hash in cache_data["entries"]:
-            entry = cache_data["entries"][prompt_hash]
-            if entry["expires_at"] > datetime.now().timestamp():
-                expires_in = datetime.fromtimestamp(entry["expires_at"]) - datetime.now()
-                print(f"Cache hit! Entry expires in {expires_in.days} days")
+        with self._lock:
+            entries = self._shard(model_name)
+            entry = entries.get(prompt_hash)
+            if entry is not None:
+                entries.move_to_end(prompt_hash)
+        if entry is not None:
+            now = time.time()
+            if entry["expires_at"] > now:
+                log.debug("Cache hit! Entry expires in %d days", int((entry["expires_at"] - now) / 86400))
                 usage_info = {**entry["usage_info"], 'cached': True}
                 return entry["response"], usage_info
             else:
-                print("Found expired cache entry, will make new API call")
+                log.debug("Found expired cache entry, will make new API call")
         return None
     
     def set(self, prompt: str, model_name: str, response: str, usage_info: Dict):
         """Cache a new response"""
         try:
-            cache_data = self._load_cache()
             prompt_hash = self._generate_hash(prompt, model_name)
             
-            print(f"\nAttempting to cache response...")
-            print(f"Cache file location: {self.cache_file}")
-            
-            cache_data["entries"][prompt_hash] = {
-                "prompt": prompt,
-                "model": model_name,
+            # Whole seconds are plenty for a multi-day expiry and keep the cache file smaller
+            now = int(time.time())
+            entry = {
                 "response": response,
                 "usage_info": usage_info,
-                "created_at": datetime.now().timestamp(),
-                "expires_at": (datetime.now() + timedelta(days=DEFAULT_EXPIRY_DAYS)).timestamp()
+                "created_at": now,
+                "expires_at": now + DEFAULT_EXPIRY_SECONDS
             }
-            
-            # Debug print before saving
-            #print(f"Cache data to write: {json.dumps(cache_data, indent=2)[:200]}...")
-            
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
-            
-            # Write with explicit encoding
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, indent=2, ensure_ascii=False)
-            
-            # Verify the file was written
-            if os.path.exists(self.cache_file):
-                file_size = os.path.getsize(self.cache_file)
-                print(f"Cache file written successfully. Size: {file_size} bytes")
-            else:
-                print("Warning: Cache file not found after writing!")
+            with self._lock:
+                entries = self._shard(model_name)
+                entries[prompt_hash] = entry
+                entries.move_to_end(prompt_hash)
+                self._evict(model_name)
+                self._append_journal({"op": "set", "model": model_name, "key": prompt_hash, "entry": entry})
+            log.debug("Cached response for %s", model_name)
             
         except Exception as e:
-            print(f"Error caching response: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Error caching response: %s", e)
     
     def clear(self):
         """Clear all cache entries"""
-        if os.path.exists(self.cache_file):
-            os.remove(self.cache_file)
+        with self._lock:
+            self._shards.clear()
+            self._pending.clear()
+            self._dirty.clear()
+            self._journal_ops = 0
+            # Queued after any pending writes, so none of them recreates a file afterwards. Waited for
+            # (under the lock), so a shard loaded next cannot read a snapshot that is about to go
+            removed = threading.Event()
+            self._writes.put(functools.partial(self._remove_files, removed))
+            removed.wait()
+    
+    def _remove_files(self, removed: threading.Event):
+        try:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            for name in os.listdir(self.shard_dir):
+                os.remove(os.path.join(self.shard_dir, name))
+            if os.path.exists(self.journal_file):
+                os.remove(self.journal_file)
+        finally:
+            removed.set()
     
     def delete(self, prompt: str, model_name: str):
         """Delete a specific cache entry"""
-        cache_data = self._load_cache()
         prompt_hash = self._generate_hash(prompt, model_name)
         
-        if prompt_hash in cache_data["entries"]:
-            del cache_data["entries"][prompt_hash]
-            self._save_cache(cache_data)
-            print(f"Deleted cache entry with hash: {prompt_hash[:8]}...")
+        with self._lock:
+            entries = self._shard(model_name)
+            if prompt_hash in entries:
+                del entries[prompt_hash]
+                self._append_journal({"op": "delete", "model": model_name, "key": prompt_hash})
+                log.debug("Deleted cache entry with hash: %s...", prompt_hash[:8])
+
+# Every cache manager is flushed by one exit handler, rather than one registration per instance
+_instances = weakref.WeakSet()
+
+@atexit.register
+def _flush_all():
+    for instance in list(_instances):
+        instance.close()
 
 # Global cache manager instance
 cache_manager = None
+_init_lock = threading.Lock()
 
 def init_cache(cache_seed: int = DEFAULT_CACHE_SEED) -> CacheManager:
     """Initialize the global cache manager"""
     global cache_manager
-    if cache_manager is None:
-        print(f"\nInitializing global cache manager with seed: {cache_seed}")
-        cache_manager = CacheManager(cache_seed)
-    else:
-        print("\nUsing existing cache manager")
-    return cache_manager 
\ No newline at end of file
+    # Concurrent first requests must not each load and prune the cache files
+    with _init_lock:
+        if cache_manager is None:
+            log.info("Initializing global cache manager with seed: %s", cache_seed)
+            cache_manager = CacheManager(cache_seed)
+        else:
+            log.debug("Using existing cache manager")
+    return cache_manager
+
+def get_cache() -> Optional[CacheManager]:
+    """
+    The global cache manager, or None before init_cache() is called.
+    Look it up through this at call time: `from cache_manager import cache_manager`
+    binds whatever the global was at import time.
+    """
+    return cache_manager
@@ -6,9 +6,16 @@ and any relevant prompts or logic for building 'SetupData'.
 """
 
 import random
-from dataclasses import asdict
 import json
 import os
+import re
+import sys
+import atexit
+import queue
+import logging
+import logging.handlers
+import asyncio
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from data_structures import (
     Character,
@@ -24,120 +31,161 @@ from data_structures import (
     BriefingMaterials,
     ProtocolReminder,
     OpeningMessage,
-    Document
+    Document,
+    NOT_READY
 )
-from ai_connectors import call_ai_model
-from utils import get_random_ai_model, write_json_to_file
-from cache_manager import cache_manager  # Only import the instance, not init_cache
+from ai_connectors import call_ai_model, acall_ai_model, run_sync
+from utils import AI_MODELS, dataclass_to_dict, write_json_to_file, json_dumps, json_loads
+
+log = logging.getLogger(__name__)
+
+# Dump the generated setup values to the console. Records are only put on a queue here and
+# written to stdout by a listener thread, so the large dumps stay off the event loop
+_DEBUG = os.getenv("DEEPSPEAK_DEBUG", "false").lower() in ['true', '1', 'yes', 'on']
+if _DEBUG:
+    _log_queue = queue.SimpleQueue()
+    _log_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler(sys.stdout))
+    log.addHandler(logging.handlers.QueueHandler(_log_queue))
+    log.setLevel(logging.DEBUG)
+    log.propagate = False
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
+# One pass over the text: string literals are matched first and kept as they are, so only
+# // comments and commas right before a closing bracket outside of strings are removed.
+# The lookahead skips comments too, since a comma is checked before the comment after it is removed
+_JSON_CLEAN_RE = re.compile(r'("[^"\\\n]*(?:\\.[^"\\\n]*)*")|//[^\n]*|,(?=(?:\s|//[^\n]*)*[}\]])')
+
+def _json_clean_sub(match: re.Match) -> str:
+    return match.group(1) or ""
+
+def _strip_code_fence(response_text: str) -> str:
+    """Return the contents of the first markdown code block (```json, ``` or any tag), or the text as is"""
+    start = response_text.find("```")
+    if start == -1:
+        return response_text
+    # Skip the fence and its language tag, if any
+    start += 3
+    while start < len(response_text) and response_text[start].isalpha():
+        start += 1
+    end = response_text.find("```", start)
+    return response_text[start:end] if end != -1 else response_text[start:]
+
+def _load_json_response(response_text: str) -> Any:
+    """
+    Parse an AI response as JSON. A response that is already valid is parsed once;
+    only one that fails is cleaned and parsed again.
+    """
+    response_text = _strip_code_fence(response_text)
+    try:
+        return json_loads(response_text)
+    except json.JSONDecodeError:
+        return json_loads(_JSON_CLEAN_RE.sub(_json_clean_sub, response_text))
 
 def clean_json_response(response_text: str) -> str:
     """Clean the response text to get valid JSON"""
     try:
-        # Remove markdown code blocks if present
-        if "```json" in response_text:
-            response_text = response_text.split("```json")[1]
-        if "```" in response_text:
-            response_text = response_text.split("```")[0]
+        response_text = _strip_code_fence(response_text)
         
-        # First try to parse as-is
+        # Most responses are already valid, and the C parser checks that faster than any cleanup
         try:
-            json.loads(response_text)
+            json_loads(response_text)
             return response_text
         except json.JSONDecodeError:
             pass
-            
-        # Clean up whitespace and newlines
-        lines = [line.strip() for line in response_text.split('\n')]
-        lines = [line for line in lines if line]  # Remove empty lines
-        
-        # Remove trailing commas
-        cleaned_lines = []
-        for i, line in enumerate(lines):
-            # Skip empty lines
-            if not line:
-                continue
-                
-            # Check if this line ends with a comma and next line starts a closing bracket
-            next_line = lines[i+1].strip() if i+1 < len(lines) else ''
-            if line.endswith(',') and (next_line.startswith('}') or next_line.startswith(']')):
-                line = line.rstrip(',')
-            cleaned_lines.append(line)
-        
-        # Join back together
-        cleaned_text = '\n'.join(cleaned_lines)
         
-        # Remove any remaining problematic commas
-        cleaned_text = cleaned_text.replace(',}', '}')
-        cleaned_text = cleaned_text.replace(',]', ']')
-        
-        # Verify the cleaned JSON is valid
-        try:
-            json.loads(cleaned_text)
-        except json.JSONDecodeError as e:
-            print(f"Warning: Failed to clean JSON: {e}")
-            print("Original response:", response_text)
-            print("Cleaned response:", cleaned_text)
-            
-        return cleaned_text
+        # Strip comments and trailing commas
+        return _JSON_CLEAN_RE.sub(_json_clean_sub, response_text).strip()
         
     except Exception as e:
         print(f"Error cleaning JSON response: {e}")
         return response_text
 
-def parse_meeting_setup_response(response_text: str) -> MeetingSetup:
-    """Parse the JSON response from AI into MeetingSetup object"""
+def parse_meeting_setup_response(response_text: str) -> Optional[MeetingSetup]:
+    """Parse the JSON response from AI into MeetingSetup object (None if it cannot be parsed)"""
     try:
-        # Clean the response first
-        cleaned_response = clean_json_response(response_text)
-        
-        # Parse the cleaned JSON
-        data = json.loads(cleaned_response)
-        
-        # Extract meeting_setup from root if needed
-        setup_data = data.get('meeting_setup', data)
-        
-        # Parse nested objects
-        location = Location(**setup_data["location"])
-        events = [Event(**e) for e in setup_data["recent_events"]]
-        seating = [SeatingArrangement(**s) for s in setup_data["room_setup"]["seating_arrangement"]]
-        room_setup = RoomSetup(
-            description=setup_data["room_setup"]["description"],
-            seating_arrangement=seating
-        )
-        purpose_ctx = PurposeAndContext(**setup_data["purpose_and_context"])
-        goal = Goal(objectives=setup_data["goal"]["objectives"])
-        docs = [Document(**d) for d in setup_data["briefing_materials"]["documents"]]
-        briefing = BriefingMaterials(documents=docs)
-        protocol = ProtocolReminder(**setup_data["protocol_reminder"])
-        opening = OpeningMessage(**setup_data["opening_message"])
-        
-        return MeetingSetup(
-            date=setup_data["date"],
-            time=setup_data["time"],
-            location=location,
-            recent_events=events,
-            summary_of_last_meetings=setup_data["summary_of_last_meetings"],
-            tags_keywords=setup_data.get("tags_keywords", ["<not_ready>"]),
-            category=setup_data.get("category", "<not_ready>"),
-            room_setup=room_setup,
-            purpose_and_context=purpose_ctx,
-            goal=goal,
-            briefing_materials=briefing,
-            protocol_reminder=protocol,
-            opening_message=opening,
-            agenda_outline=setup_data["agenda_outline"]
-        )
-        
+        return _parse_meeting_setup(response_text)[0]
     except Exception as e:
         print(f"Error parsing meeting setup: {e}")
         print("Response was:", response_text)
         return None
 
+def _parse_meeting_setup(response_text: str) -> Tuple[MeetingSetup, Dict[str, Any]]:
+    """
+    Parse the JSON response from AI into a MeetingSetup object and the same data as a plain dict.
+    Raises if the response cannot be parsed.
+    """
+    # Parse the response, cleaning it first if needed
+    return _meeting_setup_from_data(_load_json_response(response_text))
+
+def _meeting_setup_from_data(data: Dict[str, Any]) -> Tuple[MeetingSetup, Dict[str, Any]]:
+    """
+    Build a MeetingSetup object and the same data as a plain dict (what asdict() would give)
+    from the decoded response, reusing the parsed JSON instead of converting the dataclasses back.
+    """
+    # Extract meeting_setup from root if needed
+    setup_data = data.get('meeting_setup', data)
+    
+    # Parse nested objects. Constructing the dataclasses validates the keys, so the
+    # parsed dicts can be used as they are for the plain-dict copy
+    room_data = setup_data["room_setup"]
+    documents_data = setup_data["briefing_materials"]["documents"]
+    location = Location(**setup_data["location"])
+    events = [Event(**e) for e in setup_data["recent_events"]]
+    seating = [SeatingArrangement(**s) for s in room_data["seating_arrangement"]]
+    room_setup = RoomSetup(
+        description=room_data["description"],
+        seating_arrangement=seating
+    )
+    purpose_ctx = PurposeAndContext(**setup_data["purpose_and_context"])
+    goal = Goal(objectives=setup_data["goal"]["objectives"])
+    docs = [Document(**d) for d in documents_data]
+    briefing = BriefingMaterials(documents=docs)
+    protocol = ProtocolReminder(**setup_data["protocol_reminder"])
+    opening = OpeningMessage(**setup_data["opening_message"])
+    
+    meeting_setup = MeetingSetup(
+        date=setup_data["date"],
+        time=setup_data["time"],
+        location=location,
+        recent_events=events,
+        summary_of_last_meetings=setup_data["summary_of_last_meetings"],
+        # The default list is only built when the key is missing
+        tags_keywords=setup_data["tags_keywords"] if "tags_keywords" in setup_data else [NOT_READY],
+        category=setup_data.get("category", NOT_READY),
+        room_setup=room_setup,
+        purpose_and_context=purpose_ctx,
+        goal=goal,
+        briefing_materials=briefing,
+        protocol_reminder=protocol,
+        opening_message=opening,
+        agenda_outline=setup_data["agenda_outline"]
+    )
+    meeting_dict = {
+        "date": meeting_setup.date,
+        "time": meeting_setup.time,
+        "location": setup_data["location"],
+        "recent_events": setup_data["recent_events"],
+        "summary_of_last_meetings": meeting_setup.summary_of_last_meetings,
+        "tags_keywords": meeting_setup.tags_keywords,
+        "category": meeting_setup.category,
+        "room_setup": {
+            "description": room_setup.description,
+            "seating_arrangement": room_data["seating_arrangement"]
+        },
+        "purpose_and_context": setup_data["purpose_and_context"],
+        "goal": {"objectives": goal.objectives},
+        "briefing_materials": {"documents": documents_data},
+        "protocol_reminder": setup_data["protocol_reminder"],
+        "opening_message": setup_data["opening_message"],
+        "agenda_outline": meeting_setup.agenda_outline
+    }
+    return meeting_setup, meeting_dict
+
 def parse_world_context_response(response_text: str) -> WorldContext:
     """Parse the JSON response from AI into WorldContext object"""
     try:
-        cleaned_response = clean_json_response(response_text)
-        data = json.loads(cleaned_response)
+        data = _load_json_response(response_text)
         
         # Extract world_context from root if needed
         context_data = data.get('world_or_simulation_context', data)
@@ -162,17 +210,11 @@ def parse_world_context_response(response_text: str) -> WorldContext:
         print("Response was:", response_text)
         return None
 
-def generate_setup_data(topic: str) -> SetupData:
-    """
-    Generate the JSON structure based on the user-provided topic.
-    Uses AI to generate characters, world context, and meeting setup.
-    """
-    total_ttfb = 0  # Track total time to first byte
-    
-    print("\nGenerating characters...")
-    
-    # Generate characters
-    example_json = '''{
+# Example outputs and prompt text for setup generation, built once at import.
+# The topic goes last (see _setup_prompt) so every request for a section shares the same long
+# instructions + example prefix, which the provider's prompt cache can serve.
+
+_CHARACTERS_EXAMPLE = '''{
         "characters": [
             {
                 "name": "Khal",
@@ -212,8 +254,8 @@ def generate_setup_data(topic: str) -> SetupData:
             }
         ]
     }'''
-    
-    characters_prompt = f"""Topic: {topic}
+
+_CHARACTERS_PROMPT = """
     Please generate a list of 4-6 characters for this meeting/conversation.
     For each character include:
     - name
@@ -223,36 +265,12 @@ def generate_setup_data(topic: str) -> SetupData:
     
     Format the response as a clear list with all these details for each character.
     Example:
-    {example_json}
+    """ + _CHARACTERS_EXAMPLE + """
 
     Requirements: your response MUST be in valid JSON format
     """
-    
-    print("\nCalling AI for characters...")  # Add debug print
-    characters_response, usage = call_ai_model("openai-gpt", characters_prompt)
-    total_ttfb += float(usage.get('ttfb_seconds', 0))
-    print(f"\nReceived character response with usage: {usage}")  # Add debug print
-    
-    # Parse characters response with error handling
-    try:
-        cleaned_response = clean_json_response(characters_response)
-        char_data = json.loads(cleaned_response)
-        characters = []
-        for char in char_data["characters"]:
-            characters.append(Character(
-                name=char["name"],
-                position=char["position"],
-                role=char["role"],
-                hierarchy=char["hierarchy_level"],
-                assigned_model=get_random_ai_model()
-            ))
-    except Exception as e:
-        print(f"Error parsing characters: {e}")
-        print("Response was:", characters_response)
-        return None
 
-    # Generate world context
-    example_json = '''{
+_WORLD_CONTEXT_EXAMPLE = '''{
   "world_or_simulation_context": {
     "era": "Medieval Fantasy",
     "year": "300 AC (After Conquest)",
@@ -263,10 +281,9 @@ def generate_setup_data(topic: str) -> SetupData:
     "political_climate": "Feudal system with power struggles among noble families",
     "magic_and_myths": "Magic exists in the world, with dragons, White Walkers, and prophecies playing significant roles"
   }
-}'''   
-    
-    # Generate world context
-    world_context_prompt = f"""Topic: {topic}
+}'''
+
+_WORLD_CONTEXT_PROMPT = """
     Generate a detailed world context that includes:
     - Current era/time period
     - Year
@@ -279,35 +296,12 @@ def generate_setup_data(topic: str) -> SetupData:
     
     Format as a clear list of these contextual elements.
     Example:
-    {example_json}
+    """ + _WORLD_CONTEXT_EXAMPLE + """
 
     Requirements: your response MUST be in valid JSON format
     """
-    
-    # Generate world context with error handling
-    try:
-        world_context_response, usage = call_ai_model("openai-gpt", world_context_prompt)
-        total_ttfb += float(usage.get('ttfb_seconds', 0))
-        cleaned_response = clean_json_response(world_context_response)
-        ctx_data = json.loads(cleaned_response)
-        ctx = ctx_data["world_or_simulation_context"]
-        
-        world_ctx = WorldContext(
-            era=ctx["era"],
-            year=ctx["year"],
-            season=ctx["season"],
-            technological_level=ctx["technological_level"],
-            culture_and_society=ctx["culture_and_society"],
-            religions=ctx["religions"],
-            magic_and_myths=ctx["magic_and_myths"],
-            political_climate=ctx["political_climate"]
-        )
-    except Exception as e:
-        print(f"Error parsing world context: {e}")
-        print("Response was:", world_context_response)
-        return None
 
-    example_json = '''{
+_MEETING_SETUP_EXAMPLE = '''{
   "meeting_setup": {
     "date": "1234/11/23",
     "time": "15:00 <time should be in military time>",
@@ -398,13 +392,9 @@ def generate_setup_data(topic: str) -> SetupData:
     
 
   }
-}'''   
+}'''
 
-    # todo: - Tags, keywords and category of this meeting and its content
-    # add a new summary to generate the above data later.
-    
-    # Generate meeting setup
-    meeting_setup_prompt = f"""Topic: {topic}
+_MEETING_SETUP_PROMPT = """
     Generate meeting/conversation setup details including:
     - Date and time
     - Meeting location and its description
@@ -418,26 +408,159 @@ def generate_setup_data(topic: str) -> SetupData:
     - Agenda outline (briefly outline the order of discussions)
         
     Format as a clear list of these meeting elements and respond as a valid JSON object, example:
-    {example_json}
+    """ + _MEETING_SETUP_EXAMPLE + """
 
     Requirements: your response MUST be in valid JSON format.
     """
+
+_COMBINED_PROMPT = """
+    Generate the complete setup for this meeting/conversation as ONE JSON object with the keys
+    "characters", "world_or_simulation_context" and "meeting_setup", each filled in as described below.
+
+    1. Characters:""" + _CHARACTERS_PROMPT + """
+    2. World context:""" + _WORLD_CONTEXT_PROMPT + """
+    3. Meeting setup:""" + _MEETING_SETUP_PROMPT + """
+    Requirements: respond with ONE valid JSON object containing all three keys.
+    """
+
+def _setup_prompt(instructions: str, topic: str) -> str:
+    """Static instructions and example first, the varying topic last"""
+    return f"{instructions}---\n    Topic: {topic}\n"
+
+# Ask for characters, world context and meeting setup in one JSON-mode OpenAI call instead of three
+# concurrent ones. Saves two round trips and the repeated topic context, but the whole setup is then
+# generated as one long completion, which is usually slower than the three calls in parallel.
+SETUP_SINGLE_CALL = os.getenv("SETUP_SINGLE_CALL", "false").lower() in ['true', '1', 'yes', 'on']
+
+# How many times a setup section whose response cannot be parsed is requested again (0 to disable)
+SETUP_PARSE_RETRIES = int(os.getenv("SETUP_PARSE_RETRIES", "2"))
+
+def _parse_characters(response_text: str) -> Tuple[List[Character], List[Dict[str, Any]]]:
+    """Parse the characters response into Character objects and the same data as plain dicts"""
+    return _characters_from_data(_load_json_response(response_text))
+
+def _characters_from_data(data: Dict[str, Any]) -> Tuple[List[Character], List[Dict[str, Any]]]:
+    """Character objects and the same data as plain dicts from the decoded characters response"""
+    chars = data["characters"]
+    # One random model per character, drawn in a single call
+    assigned_models = random.choices(AI_MODELS, k=len(chars))
+    characters = []
+    character_dicts = []  # Same data as plain dicts for setup.json
+    for char, assigned_model in zip(chars, assigned_models):
+        char_dict = {
+            "name": char["name"],
+            "position": char["position"],
+            "role": char["role"],
+            "hierarchy": char["hierarchy_level"],
+            "assigned_model": assigned_model
+        }
+        characters.append(Character(**char_dict))
+        character_dicts.append(char_dict)
+    if not characters:
+        raise ValueError("no characters in response")
+    return characters, character_dicts
+
+def _parse_world_context(response_text: str) -> Tuple[WorldContext, Dict[str, Any]]:
+    """Parse the world context response into a WorldContext object and the same data as a plain dict"""
+    return _world_context_from_data(_load_json_response(response_text))
+
+def _world_context_from_data(data: Dict[str, Any]) -> Tuple[WorldContext, Dict[str, Any]]:
+    """WorldContext object and the same data as a plain dict from the decoded world context response"""
+    ctx = data["world_or_simulation_context"]
+    world_ctx_dict = {
+        "era": ctx["era"],
+        "year": ctx["year"],
+        "season": ctx["season"],
+        "technological_level": ctx["technological_level"],
+        "culture_and_society": ctx["culture_and_society"],
+        "religions": ctx["religions"],
+        "magic_and_myths": ctx["magic_and_myths"],
+        "political_climate": ctx["political_climate"]
+    }
+    return WorldContext(**world_ctx_dict), world_ctx_dict
+
+def _parse_combined_setup(response_text: str):
+    """Parse all three sections from a single-call setup response, decoding the JSON once"""
+    data = _load_json_response(response_text)
+    return (_characters_from_data(data), _world_context_from_data(data),
+            _meeting_setup_from_data(data))
+
+async def _generate_section(label: str, prompt: str, parse: Callable[[str], Any],
+                            options: Dict[str, Any], semantic_key: Tuple[str, str]):
+    """
+    Call the model for one setup section and parse the response. A response that cannot be
+    parsed is requested again on its own (bypassing the cache), so a bad section does not cost
+    the other sections their calls. Returns (parsed, usage_info), or None if every attempt fails.
+    """
+    refresh = False
+    retry_count = 0
+    while True:
+        response, usage = await acall_ai_model("openai-gpt", prompt, options,
+                                               semantic_key=semantic_key, refresh=refresh)
+        try:
+            return parse(response), usage
+        except Exception as e:
+            print(f"Error parsing {label}: {e}")
+            print("Response was:", response)
+            if retry_count >= SETUP_PARSE_RETRIES:
+                return None
+        retry_count += 1
+        # Exponential backoff with jitter, capped at 10s
+        delay = random.uniform(0, min(10, 2 ** retry_count))
+        print(f"Requesting {label} again in {delay:.1f}s... (Attempt {retry_count} of {SETUP_PARSE_RETRIES})")
+        await asyncio.sleep(delay)
+        refresh = True
+
+def generate_setup_data(topic: str) -> SetupData:
+    """
+    Generate the JSON structure based on the user-provided topic.
+    Sync wrapper around agenerate_setup_data.
+    """
+    return run_sync(agenerate_setup_data(topic))
+
+async def agenerate_setup_data(topic: str) -> SetupData:
+    """
+    Generate the JSON structure based on the user-provided topic.
+    Uses AI to generate characters, world context, and meeting setup.
+    """
+    print("\nGenerating characters, world context and meeting setup...")
     
-    meeting_setup_response, usage = call_ai_model("openai-gpt", meeting_setup_prompt)
-    total_ttfb += float(usage.get('ttfb_seconds', 0))
+    # todo: - Tags, keywords and category of this meeting and its content
+    # add a new summary to generate the above data later.
     
-    # Parse meeting setup
-    try:
-        meeting_setup = parse_meeting_setup_response(meeting_setup_response)
-    except Exception as e:
-        print(f"Error parsing meeting setup: {e}")
-        print("Response was:", meeting_setup_response)
-        return None
-
-    # Handle None returns from parsing
-    if not characters or not world_ctx or not meeting_setup:
-        print("Error: Failed to parse one or more required components")
-        return None
+    # Only the topic varies between runs, so the semantic cache (if enabled) compares topics per template
+    if SETUP_SINGLE_CALL:
+        print("\nCalling AI for the complete setup...")
+        result = await _generate_section(
+            "setup", _setup_prompt(_COMBINED_PROMPT, topic), _parse_combined_setup,
+            {"json_mode": True, "prompt_cache_key": "setup:combined"}, ("setup:combined", topic)
+        )
+        if result is None:
+            print("Error: Failed to parse one or more required components")
+            return None
+        # Each section is parsed from its key of the combined object
+        ((characters, character_dicts), (world_ctx, world_ctx_dict), (meeting_setup, meeting_setup_dict)), characters_usage = result
+        usages = [characters_usage]
+    else:
+        # The three prompts are independent, so they are sent concurrently,
+        # and a section that fails to parse is retried without re-sending the others.
+        # JSON mode makes the API return a bare JSON object, so the response parses on the first try
+        print("\nCalling AI for characters, world context and meeting setup...")
+        results = await asyncio.gather(
+            _generate_section("characters", _setup_prompt(_CHARACTERS_PROMPT, topic), _parse_characters,
+                              {"json_mode": True, "prompt_cache_key": "setup:characters"}, ("setup:characters", topic)),
+            _generate_section("world context", _setup_prompt(_WORLD_CONTEXT_PROMPT, topic), _parse_world_context,
+                              {"json_mode": True, "prompt_cache_key": "setup:world_context"}, ("setup:world_context", topic)),
+            _generate_section("meeting setup", _setup_prompt(_MEETING_SETUP_PROMPT, topic), _parse_meeting_setup,
+                              {"json_mode": True, "prompt_cache_key": "setup:meeting_setup"}, ("setup:meeting_setup", topic)),
+        )
+        if any(result is None for result in results):
+            print("Error: Failed to parse one or more required components")
+            return None
+        ((characters, character_dicts), characters_usage), ((world_ctx, world_ctx_dict), world_usage), ((meeting_setup, meeting_setup_dict), meeting_usage) = results
+        usages = [characters_usage, world_usage, meeting_usage]
+    total_ttfb = sum(float(usage.get('ttfb_seconds', 0)) for usage in usages)  # Total time to first byte
+    log.debug("Received character response with usage: %s", characters_usage)
 
     # Create SetupData with all fields
     setup_data = SetupData(
@@ -445,38 +568,38 @@ def generate_setup_data(topic: str) -> SetupData:
         characters=characters,
         world_or_simulation_context=world_ctx,
         meeting_setup=meeting_setup,
-        id="<not_ready>",
+        id=NOT_READY,
         version=os.getenv("VERSION", "2.0"),
-        name="<not_ready>",
+        name=NOT_READY,
         simulation_time=int(total_ttfb * 1000)  # Convert to milliseconds
     )
     
-    # Add debug prints
-    print("\nDebug - Setup Data Values:")
-    print(f"ID: {setup_data.id}")
-    print(f"Version: {setup_data.version}")
-    print(f"Name: {setup_data.name}")
-    print(f"Simulation Time: {setup_data.simulation_time}")
-    print(f"Logkeeper: {asdict(setup_data.logkeeper)}")
+    # Debug dump of the setup values
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("Setup Data Values: ID: %s, Version: %s, Name: %s, Simulation Time: %s, Logkeeper: %s",
+                  setup_data.id, setup_data.version, setup_data.name, setup_data.simulation_time,
+                  dataclass_to_dict(setup_data.logkeeper))
     
-    # Convert to dictionary and save
+    # Convert to dictionary and save; the components were kept as dicts while parsing,
+    # so only the small logkeeper is converted
     setup_dict = {
         "id": setup_data.id,
         "version": setup_data.version,
         "name": setup_data.name,
         "topic": setup_data.topic,
-        "logkeeper": asdict(setup_data.logkeeper),
+        "logkeeper": dataclass_to_dict(setup_data.logkeeper),
         "simulation_time": setup_data.simulation_time,
-        "characters": [asdict(c) for c in setup_data.characters],
-        "world_or_simulation_context": asdict(setup_data.world_or_simulation_context),
-        "meeting_setup": asdict(setup_data.meeting_setup)
+        "characters": character_dicts,
+        "world_or_simulation_context": world_ctx_dict,
+        "meeting_setup": meeting_setup_dict
     }
     
-    # Add debug print of final dict
-    print("\nDebug - Final Setup Dict:")
-    print(json.dumps(setup_dict, indent=2))
+    # Debug dump of the final dict
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("Final Setup Dict:\n%s", json_dumps(setup_dict, indent=True))
     
-    write_json_to_file(setup_dict, "setup.json")
+    # Written from a worker thread so the shared connector loop keeps serving other in-flight calls
+    await asyncio.to_thread(write_json_to_file, setup_dict, "setup.json")
     print("Generated setup.json. Please review/modify as needed before running the conversation.")
     
     return setup_data
@@ -8,9 +8,11 @@ Updated to:
 """
 
 import os
-import json
-from typing import List, Optional
-from dataclasses import asdict
+import re
+import random
+import logging
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
 
 from data_structures import (
     SetupData,
@@ -19,14 +21,39 @@ from data_structures import (
     ConversationLog,
     ManagerConfig
 )
-from ai_connectors import call_ai_model, decide_next_speaker
+from ai_connectors import (
+    call_ai_model,
+    decide_next_speaker,
+    adecide_next_speaker,
+    decide_next_speaker_speculative,
+    run_async,
+    wait_result,
+)
 from utils import (
     get_timestamp,
     approximate_word_count,
     approximate_reading_time_in_minutes,
-    append_json_log,
+    JsonArrayLog,
+    dataclass_to_dict,
+    get_debug_manager,
+    filter_system_lines,
+    json_dumps,
 )
 
+log = logging.getLogger(__name__)
+
+# "CLOSING:" label of a closing check answer, also when it follows the goal answer on the same line
+_CLOSING_LABEL = re.compile(r"closing\s*:", re.IGNORECASE)
+# Markdown, quotes and punctuation a model may put around a name
+_ANSWER_NOISE = " \t*_`\"'.,;:!?"
+
+def _strip_quotes(text: str, quotes: str) -> str:
+    """Strip whitespace, and one pair of matching quote characters (any of quotes) around the whole text"""
+    text = text.strip()
+    if len(text) > 1 and text[0] == text[-1] and text[0] in quotes:
+        text = text[1:-1].strip()
+    return text
+
 class ConversationManager:
     def __init__(
         self,
@@ -39,32 +66,75 @@ class ConversationManager:
         self.setup_data = setup_data
         self.manager_config = manager_config
         self.log_file_path = log_file_path
+        # Kept open for the whole conversation; every message is appended to the JSON array in place
+        self._log = JsonArrayLog(log_file_path)
         self.max_words = max_words
         self.max_read_minutes = max_read_minutes
+        # The manager is only asked whether the goals are met once this many words have been said
+        self.goal_check_min_words = max_words * float(os.getenv("GOAL_CHECK_MIN_WORDS_FRACTION", "0.5"))
+        # When the manager picks the previous speaker again, ask for up to this many turns in one call
+        self.continuation_turns = int(os.getenv("CONTINUATION_TURNS", "0"))
+        # Ask the manager for the next speaker only every this many turns (1 = every turn); in between
+        # the characters take turns in hierarchy order unless the last two messages change the subject
+        self.manager_every_turns = max(1, int(os.getenv("MANAGER_EVERY_N_TURNS", "1")))
+        # Once this many messages are not yet summarized, the manager folds all but the last this many
+        # into a rolling summary that replaces them in the prompts (0 = always send the full transcript)
+        self.summary_every = int(os.getenv("SUMMARY_EVERY_N_MESSAGES", "0"))
+        # Generate replies for this many likely next speakers while the manager decides (0 = off).
+        # The manager then picks every turn and each reply is one turn, so this replaces
+        # CONTINUATION_TURNS and MANAGER_EVERY_N_TURNS rather than combining with them
+        self.speculative_speakers = int(os.getenv("SPECULATIVE_SPEAKERS", "0"))
+        if self.speculative_speakers > 0 and (self.continuation_turns > 1 or self.manager_every_turns > 1):
+            log.warning("SPECULATIVE_SPEAKERS is set: CONTINUATION_TURNS and MANAGER_EVERY_N_TURNS are ignored "
+                        "unless interactive prompt debugging turns speculation off")
+        self._turns_since_manager = 0
 
         # For tracking conversation content
         self.total_word_count = 0
         self.conversation_log = ConversationLog()
 
         # Additional: track total token usage or cost
-        self.total_usage = {}
+        self.total_usage = Counter()
 
         # Add conversation time tracking
         self.current_conversation_time = 0  # in milliseconds
 
-    def calculate_message_duration(self, message: str) -> int:
+        # setup_data as (dict, JSON text) for the prompts, see _get_setup
+        self._setup = None
+
+        # "sender: message" lines of the transcript without the SystemCheck messages, extended by
+        # log_message, and their joined text (None when stale)
+        self._filtered_parts: List[str] = []
+        self._filtered_text: Optional[str] = None
+
+        # Rolling summary of the first _summarized filtered parts, see _update_summary
+        self._summary = ""
+        self._summarized = 0
+
+        # Character names in setup order, and each name's (first) character for speaker lookups
+        self._character_names = [c.name for c in setup_data.characters]
+        self._characters_by_name = {c.name: c for c in reversed(setup_data.characters)}
+        self._names_by_lower = {name.lower(): name for name in reversed(self._character_names)}
+        self._speaking_rotation = [c.name for c in sorted(setup_data.characters, key=lambda c: c.hierarchy)]
+
+        # Per-character tail of the reply prompt, see _build_character_prompt
+        self._reply_instructions: Dict[str, str] = {}
+
+        # Closing speaker answer given with the goal check that ended the meeting, see check_end_conditions
+        self._closing_answer: Optional[str] = None
+
+    def calculate_message_duration(self, message: str, word_count: Optional[int] = None) -> int:
         """
         Calculate how long a message would take to say in milliseconds.
         Uses a rough approximation:
         - Base time per word (300ms)
         - Extra time for punctuation pauses
         - Random variation for natural feel
+        word_count can be passed when the caller has already counted the words.
         """
-        import random
-        
         # Base calculation
-        words = message.split()
-        word_count = len(words)
+        if word_count is None:
+            word_count = approximate_word_count(message)
         base_duration = word_count * 300  # 300ms per word
         
         # Add time for punctuation pauses
@@ -82,7 +152,6 @@ class ConversationManager:
         
     def calculate_speaker_pause(self) -> int:
         """Calculate natural pause between speakers"""
-        import random
         return random.randint(500, 2000)  # 0.5 to 2 seconds
 
     def log_message(
@@ -93,15 +162,18 @@ class ConversationManager:
         We also keep track of usage tokens if provided.
         """
         timestamp = get_timestamp()
+        system_check = sender.startswith("SystemCheck")
+        # The manager's checks and summaries are not spoken, so they count no words
+        word_count = 0 if system_check else approximate_word_count(message)
         
         # Only advance conversation time for non-system messages
-        if not sender.startswith("SystemCheck"):
+        if not system_check:
             # Add pause if this isn't the first message
             if self.conversation_log.messages:
                 self.current_conversation_time += self.calculate_speaker_pause()
             
             # Add message duration
-            message_duration = self.calculate_message_duration(message)
+            message_duration = self.calculate_message_duration(message, word_count)
             
             conversation_time = self.current_conversation_time
             self.current_conversation_time += message_duration
@@ -115,6 +187,9 @@ class ConversationManager:
             model_used=model_used
         )
         self.conversation_log.messages.append(msg_log)
+        if not system_check:
+            self._filtered_parts.append(filter_system_lines(f"{sender}: {message}"))
+            self._filtered_text = None
 
         # Prepare log entry for disk
         log_entry = {
@@ -131,10 +206,10 @@ class ConversationManager:
             self._accumulate_usage(usage_info)
 
         # Write to file
-        append_json_log(log_entry, self.log_file_path)
+        self._log.append(log_entry)
 
         # Update word count
-        self.total_word_count += approximate_word_count(message)
+        self.total_word_count += word_count
 
     def _accumulate_usage(self, usage_info: dict):
         """
@@ -146,42 +221,27 @@ class ConversationManager:
             "total_tokens": 75
         }
         We'll keep a rolling sum in self.total_usage.
+        Only int counts are summed; floats such as ttfb_seconds and flags such as cached are skipped.
         """
-        for k, v in usage_info.items():
-            if not isinstance(v, int):
-                continue
-            if k not in self.total_usage:
-                self.total_usage[k] = 0
-            self.total_usage[k] += v
+        total_usage = self.total_usage
+        for key, value in usage_info.items():
+            if type(value) is int:
+                total_usage[key] += value
 
     def check_end_conditions(self) -> bool:
-        """Check if the conversation should end"""
+        """
+        Check if the conversation should end.
+        The same manager call also asks who should give the closing message, so
+        determine_closing_message does not need a second call once the goals are met.
+        """
+        # Too early for the meeting to have reached its goals; skip the manager call
+        if self.total_word_count < self.goal_check_min_words:
+            return False
+
         # Get and filter conversation text
-        conversation_text = self._get_conversation_text()
-        conversation_lines = conversation_text.split('\n')
-        filtered_lines = [
-            line for line in conversation_lines 
-            if not line.startswith("SystemCheck:") and 
-            not "[Goal Check]" in line and 
-            not "[Closing Check]" in line
-        ]
-        filtered_conversation = '\n'.join(filtered_lines)
-
-        # Convert setup_data to dict for JSON serialization
-        setup_dict = {
-            "id": self.setup_data.id,
-            "version": self.setup_data.version,
-            "name": self.setup_data.name,
-            "topic": self.setup_data.topic,
-            "logkeeper": asdict(self.setup_data.logkeeper),
-            "simulation_time": self.setup_data.simulation_time,
-            "characters": [asdict(c) for c in self.setup_data.characters],
-            "world_or_simulation_context": asdict(self.setup_data.world_or_simulation_context),
-            "meeting_setup": asdict(self.setup_data.meeting_setup)
-        }
+        filtered_conversation = self._get_filtered_conversation()
 
-        # Convert to JSON
-        setup_json = json.dumps(setup_dict, indent=2)
+        setup_json = self._get_setup()[1]
 
         # Create the prompt with filtered conversation
         prompt = (
@@ -196,36 +256,48 @@ class ConversationManager:
             "1. Have all key points been discussed?\n"
             "2. Has a clear decision or conclusion been reached?\n"
             "3. Have all participants contributed meaningfully?\n\n"
-            "Answer YES or NO only."
+            "If yes, do we need a final closing message to wrap up?\n\n"
+            "Answer in exactly two lines:\n"
+            "GOAL: YES or NO\n"
+            "CLOSING: the EXACT name of who should speak the closing message, or NO"
         )
 
         response_text, usage = call_ai_model(self.manager_config.manager_model, prompt)
+        goal_line, _, closing_line = response_text.strip().partition('\n')
+        # A one-line answer ("GOAL: YES, CLOSING: Jon Snow") carries both
+        label = _CLOSING_LABEL.search(goal_line)
+        if label:
+            goal_line, closing_line = goal_line[:label.start()].rstrip(" ,;"), goal_line[label.start():]
+        goal_met = "YES" in goal_line.upper()
         
-        # Log the check
+        # Log the check (one line per answer, so the transcript filter drops both)
         self.log_message(
             sender="SystemCheck",
-            message=f"[Goal Check] {response_text}",
+            message=f"[Goal Check] {goal_line}",
             model_used=self.manager_config.manager_model,
             usage_info=usage
         )
+        if goal_met:
+            self._closing_answer = closing_line.strip()
+            self.log_message(
+                sender="SystemCheck",
+                message=f"[Closing Check] {self._closing_answer}",
+                model_used=self.manager_config.manager_model
+            )
 
-        return "YES" in response_text.upper()
+        return goal_met
 
     def determine_closing_message(self) -> Optional[str]:
         """
         If a closing message is required, we ask the manager model.
         Returns the name of the character or None if no closing message is needed.
         """
+        # Already answered by the goal check that ended the meeting
+        if self._closing_answer is not None:
+            return self._parse_closing_speaker(self._closing_answer)
+
         # Get and filter conversation text
-        conversation_text = self._get_conversation_text()
-        conversation_lines = conversation_text.split('\n')
-        filtered_lines = [
-            line for line in conversation_lines 
-            if not line.startswith("SystemCheck:") and 
-            not "[Goal Check]" in line and 
-            not "[Closing Check]" in line
-        ]
-        filtered_conversation = '\n'.join(filtered_lines)
+        filtered_conversation = self._get_filtered_conversation()
 
         prompt = (
             "Based on the conversation, do we need a final closing message to wrap up?\n"
@@ -241,28 +313,33 @@ class ConversationManager:
             model_used=self.manager_config.manager_model,
             usage_info=usage
         )
+        return self._parse_closing_speaker(response_text)
 
-        if "NO" in response_text.upper():
-            return None
-        # We attempt to parse out a name from the response
-        chosen_speaker = response_text.strip()
-        # If invalid, set None
-        all_names = [c.name for c in self.setup_data.characters]
-        if chosen_speaker not in all_names:
+    def _parse_closing_speaker(self, response_text: str) -> Optional[str]:
+        """
+        Character name from a closing check answer, or None if no closing message is needed.
+        Tolerates a "CLOSING:" label anywhere, markdown, quotes, punctuation and letter case
+        around the name, and a name mentioned in a short sentence.
+        """
+        label = _CLOSING_LABEL.search(response_text)
+        answer = response_text[label.end():] if label else response_text
+        answer = answer.strip().split('\n', 1)[0].strip(_ANSWER_NOISE)
+        # Matched against the names rather than searched for "NO" (names such as "Jon Snow" contain "NO")
+        name = self._names_by_lower.get(answer.lower())
+        if name is not None:
+            return name
+        if re.match(r"no\b", answer, re.IGNORECASE):
             return None
-        return chosen_speaker
+        # e.g. "Jon Snow should close the meeting": the longest name mentioned
+        lowered = answer.lower()
+        for name in sorted(self._character_names, key=len, reverse=True):
+            if name.lower() in lowered:
+                return name
+        return None
 
     def clean_closing_text(self, text: str) -> str:
         """Clean up closing text by removing quotes"""
-        # Remove leading/trailing whitespace
-        text = text.strip()
-        
-        # Remove opening/closing quotes if present
-        if (text.startswith('"') and text.endswith('"')) or \
-           (text.startswith("'") and text.endswith("'")):
-            text = text[1:-1]
-        
-        return text.strip()
+        return _strip_quotes(text, "\"'")
 
     def run_conversation(self):
         """
@@ -272,7 +349,7 @@ class ConversationManager:
         """
         # Start with the opening message
         opening_message = self.setup_data.meeting_setup.opening_message
-        print(f"\n{opening_message.speaker}: {opening_message.message}")
+        log.info("\n%s: %s", opening_message.speaker, opening_message.message)
         
         # Add opening message to conversation log
         self.log_message(
@@ -281,44 +358,17 @@ class ConversationManager:
             model_used="None"  # Opening message doesn't use an AI model
         )
         
-        # Normal conversation loop
-        while True:
-            # Get full conversation text and filter out system messages
-            conversation_text = self._get_conversation_text()
-            conversation_lines = conversation_text.split('\n')
-            filtered_lines = [
-                line for line in conversation_lines 
-                if not line.startswith("SystemCheck:") and 
-                not "[Goal Check]" in line and 
-                not "[Closing Check]" in line
-            ]
-            filtered_conversation = '\n'.join(filtered_lines)
-
-            character_names = [c.name for c in self.setup_data.characters]
-
-            # Convert setup_data to dict for JSON serialization
-            setup_dict = {
-                "id": self.setup_data.id,
-                "version": self.setup_data.version,
-                "name": self.setup_data.name,
-                "topic": self.setup_data.topic,
-                "logkeeper": asdict(self.setup_data.logkeeper),
-                "simulation_time": self.setup_data.simulation_time,
-                "characters": [asdict(c) for c in self.setup_data.characters],
-                "world_or_simulation_context": asdict(self.setup_data.world_or_simulation_context),
-                "meeting_setup": asdict(self.setup_data.meeting_setup)
-            }
+        # Next speaker chosen while the previous turn's goal check ran, see below
+        next_speaker_future = None
 
-            # First decide who speaks next
-            next_speaker_name = decide_next_speaker(
-                manager_model=self.manager_config.manager_model,
-                conversation_so_far=filtered_conversation,
-                character_names=character_names,
-                setup_data=setup_dict
-            )
+        # Setup data as a dict and as JSON for the turn and closing prompts
+        setup_dict, setup_json = self._get_setup()
+        character_names = self._character_names
 
-            # Convert setup_data to JSON for the prompt
-            setup_json = json.dumps(setup_dict, indent=2)
+        # Normal conversation loop
+        while True:
+            # Conversation text so far, without the system messages
+            filtered_conversation = self._get_filtered_conversation()
 
             # Get last message and sender
             last_message = ""
@@ -334,56 +384,87 @@ class ConversationManager:
                     last_message = last_msg.message
                     last_message_sender = last_msg.sender
 
-            character = next(
-                (c for c in self.setup_data.characters if c.name == next_speaker_name),
-                self.setup_data.characters[0]
-            )
-
-            example_json = '''
-    "message": {
-      "speaker": "Khaleesi",
-      "message": "Esteemed members of the council..."
-    }
-            '''
-
-            character_prompt = (
-                "This is the meeting setup data in JSON format:\n"
-                "----------------------\n"
-                f"{setup_json}\n"  # Pretty print the setup data
-                "----------------------\n"
-                "Here is the conversation so far:\n"
-                "----------------------\n"
-                f"{filtered_conversation}\n"  # Use filtered conversation instead
-                "----------------------\n"
-                #f"Last message from {last_message_sender}: {last_message}\n\n"
-                f"You are {character.name}, a {character.position}.\n"
-                "Please respond in-character. DO NOT REPEAT WHAT YOU HAVE SAID. Keep your response concise and to the point, like a movie dialogue. Do not start your response with YOUR NAME:, no actions or descriptions, just respond with your message."
-            )
-
-            reply_text, usage = call_ai_model(character.assigned_model, character_prompt)
+            # Speculation runs several prompts at once, so it is skipped under interactive debugging
+            speculative_k = self.speculative_speakers
+            continuing = False
+            if speculative_k > 0 and not get_debug_manager().should_prompt():
+                # Decide who speaks next while the likeliest speakers' replies are generated
+                def build_reply(name: str):
+                    # Runs on the connector loop; an unknown name is logged by _get_character below
+                    speaker = self._characters_by_name.get(name) or self.setup_data.characters[0]
+                    return speaker.assigned_model, self._build_character_prompt(speaker, setup_json, filtered_conversation)
+
+                next_speaker_name, reply_text, usage = decide_next_speaker_speculative(
+                    manager_model=self.manager_config.manager_model,
+                    conversation_so_far=filtered_conversation,
+                    character_names=character_names,
+                    setup_data=setup_dict,
+                    build_reply=build_reply,
+                    last_speaker=last_message_sender,
+                    top_k=speculative_k
+                )
+                character = self._get_character(next_speaker_name)
+            else:
+                # First decide who speaks next
+                if next_speaker_future is not None:
+                    next_speaker_name = wait_result(next_speaker_future)
+                    next_speaker_future = None
+                elif self._turns_since_manager + 1 < self.manager_every_turns and not self._topic_shifted():
+                    next_speaker_name = self._next_in_rotation(last_message_sender)
+                    self._turns_since_manager += 1
+                else:
+                    next_speaker_name = decide_next_speaker(
+                        manager_model=self.manager_config.manager_model,
+                        conversation_so_far=filtered_conversation,
+                        character_names=character_names,
+                        setup_data=setup_dict
+                    )
+                    self._turns_since_manager = 0
+                character = self._get_character(next_speaker_name)
+                character_prompt = self._build_character_prompt(character, setup_json, filtered_conversation)
+                # The same speaker again: one call for several consecutive turns of their remarks
+                continuing = self.continuation_turns > 1 and character.name == last_message_sender
+                if continuing:
+                    character_prompt += (
+                        f"\nYou are continuing your remarks: reply with up to {self.continuation_turns} short "
+                        "paragraphs separated by a blank line."
+                    )
+                reply_text, usage = call_ai_model(character.assigned_model, character_prompt)
             
-            # Clean the response text - remove surrounding quotes if present
-            reply_text = reply_text.strip()
-            if reply_text.startswith('"') and reply_text.endswith('"'):
-                reply_text = reply_text[1:-1].strip()
-            
-            # Log the cleaned message
-            self.log_message(character.name, reply_text, model_used=character.assigned_model, usage_info=usage)
+            # A continuation is logged as one message per paragraph
+            replies = [reply_text]
+            if continuing:
+                replies = [part for part in reply_text.split("\n\n") if part.strip()][:self.continuation_turns] or replies
+            for i, reply_text in enumerate(replies):
+                # Clean the response text - remove surrounding quotes if present
+                reply_text = _strip_quotes(reply_text, '"')
+                
+                # Log the cleaned message (the call's usage goes with the first part)
+                self.log_message(character.name, reply_text, model_used=character.assigned_model,
+                                 usage_info=usage if i == 0 else None)
+
+            # The reply is complete, so the next speaker can be chosen now on the connector loop, while the
+            # summary is updated and the end conditions are checked; the choice is dropped if the meeting ends
+            if self.manager_every_turns == 1 and speculative_k <= 0 and not get_debug_manager().should_prompt():
+                next_speaker_future = run_async(adecide_next_speaker(
+                    manager_model=self.manager_config.manager_model,
+                    conversation_so_far=self._get_filtered_conversation(),
+                    character_names=character_names,
+                    setup_data=setup_dict
+                ))
+            self._update_summary()
 
             # Check if the meeting ends
             if self.check_end_conditions():
+                if next_speaker_future is not None:
+                    next_speaker_future.cancel()
                 break
 
         # 11. Potential closing message
         closer_name = self.determine_closing_message()
         if closer_name:
-            closer_character = next(
-                (c for c in self.setup_data.characters if c.name == closer_name),
-                self.setup_data.characters[0]
-            )
-            print(
-                f"\nGenerating closing message from {closer_character.name}..."
-            )
+            closer_character = self._get_character(closer_name)
+            log.info("\nGenerating closing message from %s...", closer_character.name)
             closing_prompt = (
                 "This is the meeting setup data in JSON format:\n"
                 "----------------------\n"
@@ -410,19 +491,141 @@ class ConversationManager:
 
         # Final log of usage summary (optional)
         self._log_usage_summary()
+        self.close()
+
+    def close(self):
+        """Close the log file (it is reopened if more messages are logged)"""
+        self._log.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _get_setup(self) -> Tuple[dict, str]:
+        """
+        setup_data as a dict and as indented JSON for the prompts.
+        Built on first use and reused, since the setup does not change during a conversation.
+        """
+        if self._setup is None:
+            setup_dict = {
+                "id": self.setup_data.id,
+                "version": self.setup_data.version,
+                "name": self.setup_data.name,
+                "topic": self.setup_data.topic,
+                "logkeeper": dataclass_to_dict(self.setup_data.logkeeper),
+                "simulation_time": self.setup_data.simulation_time,
+                "characters": [dataclass_to_dict(c) for c in self.setup_data.characters],
+                "world_or_simulation_context": dataclass_to_dict(self.setup_data.world_or_simulation_context),
+                "meeting_setup": dataclass_to_dict(self.setup_data.meeting_setup)
+            }
+            self._setup = (setup_dict, json_dumps(setup_dict, indent=True))
+        return self._setup
+
+    def _next_in_rotation(self, last_speaker: str) -> str:
+        """The character after last_speaker in hierarchy order (the first one if last_speaker is not a character)"""
+        rotation = self._speaking_rotation
+        if last_speaker in self._characters_by_name:
+            return rotation[(rotation.index(last_speaker) + 1) % len(rotation)]
+        return rotation[0]
+
+    def _topic_shifted(self, threshold: float = 0.1) -> bool:
+        """
+        True if the last two messages share little vocabulary (word-set Jaccard similarity below
+        threshold), a cheap sign the discussion moved on and the manager should pick the speaker
+        """
+        recent = []
+        for msg in reversed(self.conversation_log.messages):
+            if msg.sender not in ("SystemCheck", "System"):
+                recent.append(set(msg.message.lower().split()))
+                if len(recent) == 2:
+                    break
+        if len(recent) < 2 or not (recent[0] or recent[1]):
+            return False
+        return len(recent[0] & recent[1]) / len(recent[0] | recent[1]) < threshold
+
+    def _get_character(self, name: str) -> Character:
+        """Character with the given name, falling back to the first character (logged as a SystemCheck)"""
+        character = self._characters_by_name.get(name)
+        if character is None:
+            character = self.setup_data.characters[0]
+            self.log_message(
+                sender="SystemCheck",
+                message=f"[Unknown speaker] {name!r}, using {character.name}",
+                model_used=self.manager_config.manager_model
+            )
+        return character
+
+    def _build_character_prompt(self, character: Character, setup_json: str, filtered_conversation: str) -> str:
+        """
+        Prompt asking character for its next in-character reply.
+        The setup and the (append-only) conversation come first and are the same for every speaker,
+        so consecutive turns share their whole prefix for provider prompt caching; only the short
+        per-character instruction, built once per character, follows it.
+        """
+        instruction = self._reply_instructions.get(character.name)
+        if instruction is None:
+            instruction = self._reply_instructions[character.name] = (
+                "----------------------\n"
+                #f"Last message from {last_message_sender}: {last_message}\n\n"
+                f"You are {character.name}, a {character.position}.\n"
+                "Please respond in-character. DO NOT REPEAT WHAT YOU HAVE SAID. Keep your response concise and to the point, like a movie dialogue. Do not start your response with YOUR NAME:, no actions or descriptions, just respond with your message."
+            )
+        return (
+            "This is the meeting setup data in JSON format:\n"
+            "----------------------\n"
+            f"{setup_json}\n"  # Pretty print the setup data
+            "----------------------\n"
+            "Here is the conversation so far:\n"
+            "----------------------\n"
+            f"{filtered_conversation}\n"  # Use filtered conversation instead
+            f"{instruction}"
+        )
 
-    def _get_conversation_text(self) -> str:
+    def _get_filtered_conversation(self) -> str:
         """
-        Helper to return the conversation so far as a single string.
+        Helper to return the conversation so far as a single string, without the manager's checks.
+        Joined once per new message; repeated calls between messages reuse the text.
         """
-        lines = []
-        for msg in self.conversation_log.messages:
-            lines.append(f"{msg.sender}: {msg.message}")
-        return "\n".join(lines)
+        if self._filtered_text is None:
+            recent = "\n".join(self._filtered_parts[self._summarized:])
+            if self._summary:
+                recent = f"(Summary of the earlier conversation: {self._summary})\n{recent}"
+            self._filtered_text = recent
+        return self._filtered_text
+
+    def _update_summary(self):
+        """
+        With SUMMARY_EVERY_N_MESSAGES set, once 2 * N messages are not yet summarized, ask the manager
+        to fold all but the last N of them into the rolling summary. Prompts then carry the summary and
+        the recent messages instead of the whole transcript, so they stop growing with every turn.
+        """
+        keep = self.summary_every
+        if keep <= 0 or len(self._filtered_parts) - self._summarized < 2 * keep:
+            return
+        end = len(self._filtered_parts) - keep
+        earlier = "\n".join(self._filtered_parts[self._summarized:end])
+        prompt = (
+            "Summarize this meeting conversation for the participants' notes. Keep who said what, "
+            "decisions, open questions and commitments. Reply with the summary only.\n\n"
+            + (f"Summary so far:\n{self._summary}\n\n" if self._summary else "")
+            + f"Conversation to add:\n{earlier}\n"
+        )
+        summary, usage = call_ai_model(self.manager_config.manager_model, prompt)
+        self._summary = " ".join(summary.split())
+        self._summarized = end
+        self._filtered_text = None
+        self.log_message(
+            sender="SystemCheck",
+            message=f"[Summary] {self._summary}",
+            model_used=self.manager_config.manager_model,
+            usage_info=usage
+        )
 
     def _log_usage_summary(self):
         """
         Optional: Log final usage info so the user can see total tokens used, etc.
         """
-        summary_message = f"Token usage summary: {self.total_usage}"
+        summary_message = f"Token usage summary: {dict(self.total_usage)}"
         self.log_message("System", summary_message, model_used="None")
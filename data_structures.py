@@ -9,7 +9,14 @@ from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any
 import os
 
-@dataclass
+# Placeholder for setup values that are filled in later
+NOT_READY = "<not_ready>"
+
+def _from_dict(cls, data: Dict[str, Any]):
+    """Build a flat dataclass from its JSON dict, ignoring unknown keys (missing ones take the field default)"""
+    return cls(**{name: data[name] for name in cls.__dataclass_fields__ if name in data})
+
+@dataclass(slots=True)
 class Character:
     name: str
     position: str
@@ -17,7 +24,7 @@ class Character:
     hierarchy: int
     assigned_model: str
 
-@dataclass
+@dataclass(slots=True)
 class WorldContext:
     era: str
     year: str
@@ -28,7 +35,7 @@ class WorldContext:
     magic_and_myths: str
     political_climate: str
 
-@dataclass
+@dataclass(slots=True)
 class Location:
     name: str
     coordinates: str
@@ -36,50 +43,50 @@ class Location:
     longitude: float
     description: str
 
-@dataclass
+@dataclass(slots=True)
 class Event:
     event_description: str
 
-@dataclass
+@dataclass(slots=True)
 class Document:
     title: str
     description: str
 
-@dataclass
+@dataclass(slots=True)
 class SeatingArrangement:
     position: int
     name: str
     role: str
 
-@dataclass
+@dataclass(slots=True)
 class RoomSetup:
     description: str
     seating_arrangement: List[SeatingArrangement]
 
-@dataclass
+@dataclass(slots=True)
 class PurposeAndContext:
     purpose: str
     context: str
 
-@dataclass
+@dataclass(slots=True)
 class Goal:
     objectives: List[str]
 
-@dataclass
+@dataclass(slots=True)
 class BriefingMaterials:
     documents: List[Document]
 
-@dataclass
+@dataclass(slots=True)
 class ProtocolReminder:
     speaking_order: List[str]
     customs: List[str]
 
-@dataclass
+@dataclass(slots=True)
 class OpeningMessage:
     speaker: str
     message: str
 
-@dataclass
+@dataclass(slots=True)
 class MeetingSetup:
     date: str
     time: str
@@ -96,14 +103,40 @@ class MeetingSetup:
     opening_message: OpeningMessage
     agenda_outline: Dict[str, str]
 
-@dataclass
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MeetingSetup":
+        """Build the meeting setup and its nested objects from the setup.json "meeting_setup" dict"""
+        room = data["room_setup"]
+        return cls(
+            date=data["date"],
+            time=data["time"],
+            location=_from_dict(Location, data["location"]),
+            recent_events=[_from_dict(Event, e) for e in data["recent_events"]],
+            summary_of_last_meetings=data["summary_of_last_meetings"],
+            tags_keywords=data.get("tags_keywords", [NOT_READY]),
+            category=data.get("category", NOT_READY),
+            room_setup=RoomSetup(
+                description=room["description"],
+                seating_arrangement=[_from_dict(SeatingArrangement, s) for s in room["seating_arrangement"]]
+            ),
+            purpose_and_context=_from_dict(PurposeAndContext, data["purpose_and_context"]),
+            goal=Goal(objectives=data["goal"]["objectives"]),
+            briefing_materials=BriefingMaterials(
+                documents=[_from_dict(Document, d) for d in data["briefing_materials"]["documents"]]
+            ),
+            protocol_reminder=_from_dict(ProtocolReminder, data["protocol_reminder"]),
+            opening_message=_from_dict(OpeningMessage, data["opening_message"]),
+            agenda_outline=data["agenda_outline"]
+        )
+
+@dataclass(slots=True)
 class Logkeeper:
     name: str = "The Logkeeper"
     position: str = "Logkeeper"
     role: str = "Group chat manager. Logs the meeting and provides a summary of the meeting"
     assigned_model: str = "openai"
 
-@dataclass
+@dataclass(slots=True)
 class SetupData:
     """
     This combines everything needed for the conversation.
@@ -112,13 +145,25 @@ class SetupData:
     characters: List[Character]
     world_or_simulation_context: WorldContext
     meeting_setup: MeetingSetup
-    id: str = "<not_ready>"
+    id: str = NOT_READY
     version: str = os.getenv("VERSION", "2.0")
-    name: str = "<not_ready>"
+    name: str = NOT_READY
     logkeeper: Logkeeper = field(default_factory=Logkeeper)
     simulation_time: int = 0  # Will be updated with total ttfb_seconds
 
-@dataclass
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SetupData":
+        """Build the setup from a loaded setup.json dict; unknown keys are ignored"""
+        return cls(
+            topic=data["topic"],
+            characters=[_from_dict(Character, c) for c in data["characters"]],
+            world_or_simulation_context=_from_dict(WorldContext, data["world_or_simulation_context"]),
+            meeting_setup=MeetingSetup.from_dict(data["meeting_setup"]),
+            logkeeper=_from_dict(Logkeeper, data.get("logkeeper", {})),
+            **{name: data[name] for name in ("id", "version", "name", "simulation_time") if name in data}
+        )
+
+@dataclass(slots=True)
 class MessageLog:
     timestamp: str
     sender: str
@@ -126,11 +171,11 @@ class MessageLog:
     # You can add more fields like "model_used", "role", etc.
     model_used: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class ConversationLog:
     messages: List[MessageLog] = field(default_factory=list)
 
-@dataclass
+@dataclass(slots=True)
 class ManagerConfig:
     """
     Configuration for the 'group chat manager' AI model or selection method.
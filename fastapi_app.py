@@ -9,28 +9,36 @@ A simple FastAPI application providing endpoints to:
 import os
 import json
 import random
+import asyncio
+import logging
 from typing import Optional
 from fastapi_app import FastAPI, Body
 
-from conversation_flow import generate_setup_data
+from conversation_flow import agenerate_setup_data
+from ai_connectors import run_async
 from data_structures import SetupData, ManagerConfig
 from conversation_manager import ConversationManager
-from utils import get_timestamp
+from utils import get_file_timestamp, AI_MODELS
 from cache_manager import init_cache, DEFAULT_CACHE_SEED
 
+# The server only logs warnings by default; LOG_LEVEL=INFO shows the per-meeting progress messages
+logging.basicConfig(level=(os.getenv("LOG_LEVEL") or "WARNING").upper())
+
 app = FastAPI()
 
 @app.post("/generate_setup")
-def api_generate_setup(
+async def api_generate_setup(
     request: dict = Body(...),  # {"topic": "...", "cache_seed": 42}
 ):
     topic = request["topic"]
     cache_seed = request.get("cache_seed", DEFAULT_CACHE_SEED)
     
     init_cache(cache_seed)
-    data = generate_setup_data(topic)
+    # Generated on the shared connector loop and awaited, so no server thread waits on the model calls
+    data = await asyncio.wrap_future(run_async(agenerate_setup_data(topic)))
     return data
 
+# A plain def route: FastAPI runs the blocking conversation loop in its threadpool, off the event loop
 @app.post("/run_conversation")
 def api_run_conversation(
     setup: dict = Body(...),
@@ -41,64 +49,16 @@ def api_run_conversation(
     'manager_model' can be optionally provided, otherwise chosen randomly.
     """
     # Convert dict to SetupData object
-    from data_structures import Character, WorldContext, MeetingSetup
-
-    characters = []
-    for cdata in setup["characters"]:
-        characters.append(
-            Character(
-                name=cdata["name"],
-                position=cdata["position"],
-                role=cdata["role"],
-                hierarchy=cdata["hierarchy"],
-                assigned_model=cdata["assigned_model"]
-            )
-        )
-    wctx = setup["world_or_simulation_context"]
-    world_ctx = WorldContext(
-        era=wctx["era"],
-        year=wctx["year"],
-        season=wctx["season"],
-        technological_level=wctx["technological_level"],
-        culture_and_society=wctx["culture_and_society"],
-        religions=wctx["religions"],
-        magic_and_myths=wctx["magic_and_myths"],
-        political_climate=wctx["political_climate"]
-    )
-    mset = setup["meeting_setup"]
-    meeting_setup = MeetingSetup(
-        date=mset["date"],
-        time=mset["time"],
-        meeting_location=mset["meeting_location"],
-        meeting_location_description=mset["meeting_location_description"],
-        recent_events=mset["recent_events"],
-        summary_of_last_meetings=mset["summary_of_last_meetings"],
-        tags_keywords=mset["tags_keywords"],
-        category=mset["category"],
-        room_setup=mset["room_setup"],
-        purpose_and_context=mset["purpose_and_context"],
-        goal=mset["goal"],
-        briefing_materials=mset["briefing_materials"],
-        protocol_reminder=mset["protocol_reminder"],
-        customary_opening_message=mset["customary_opening_message"],
-        agenda_outline=mset["agenda_outline"]
-    )
-
-    setup_data = SetupData(
-        topic=setup["topic"],
-        characters=characters,
-        world_or_simulation_context=world_ctx,
-        meeting_setup=meeting_setup
-    )
+    setup_data = SetupData.from_dict(setup)
 
     # Manager model
     if not manager_model:
-        manager_model = random.choice(["openai-gpt", "claude", "gemini", "deepseek", "ollama"])
+        manager_model = random.choice(AI_MODELS)
 
     manager_config = ManagerConfig(manager_model=manager_model)
 
     # Log file path
-    timestamp = get_timestamp().replace(":", "").replace(" ", "_")
+    timestamp = get_file_timestamp()
     log_file_path = f"meeting_log_{timestamp}.json"
 
     cm = ConversationManager(setup_data, manager_config, log_file_path)
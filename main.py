@@ -12,15 +12,16 @@ Usage:
 import sys
 import json
 import os
+import random
 import argparse
+import logging
 from cache_manager import init_cache  # Import this first
 
 # Import other modules at the top level
 from conversation_flow import generate_setup_data
 from conversation_manager import ConversationManager
-from data_structures import SetupData, ManagerConfig, Character, WorldContext, MeetingSetup, Location, Event, SeatingArrangement, RoomSetup, PurposeAndContext, Goal, BriefingMaterials, Document, ProtocolReminder, OpeningMessage, Logkeeper
-from utils import write_json_to_file, get_timestamp
-from dataclasses import asdict
+from data_structures import SetupData, ManagerConfig
+from utils import get_file_timestamp, AI_MODELS, json_loads
 
 def cli_generate_setup(provided_prompt=None):
     """
@@ -37,78 +38,20 @@ def cli_generate_setup(provided_prompt=None):
     if data is None:
         print("Failed to generate setup data. Please try again.")
         return
-    
-    # Convert dataclass to dictionary for JSON dumping
-    setup_dict = {
-        "topic": data.topic,
-        "characters": [asdict(c) for c in data.characters],
-        "world_or_simulation_context": asdict(data.world_or_simulation_context),
-        "meeting_setup": asdict(data.meeting_setup)
-    }
-
-    output_file = "setup.json"
-    write_json_to_file(setup_dict, output_file)
-    print(f"Generated {output_file}. Please review/modify as needed before running the conversation.")
+    # generate_setup_data has already written the complete setup.json
 
 def cli_run_conversation(setup_file: str):
     """Run a conversation from a setup file"""
     try:
         # Load setup file
-        with open(setup_file, 'r') as f:
-            setup_dict = json.load(f)
+        with open(setup_file, 'rb') as f:
+            setup_dict = json_loads(f.read())
         
         # Convert dictionary to SetupData object
-        characters = [Character(**c) for c in setup_dict["characters"]]
-        world_ctx = WorldContext(**setup_dict["world_or_simulation_context"])
-        
-        # Convert meeting setup nested objects
-        meeting_dict = setup_dict["meeting_setup"]
-        location = Location(**meeting_dict["location"])
-        events = [Event(**e) for e in meeting_dict["recent_events"]]
-        seating = [SeatingArrangement(**s) for s in meeting_dict["room_setup"]["seating_arrangement"]]
-        room_setup = RoomSetup(
-            description=meeting_dict["room_setup"]["description"],
-            seating_arrangement=seating
-        )
-        purpose_ctx = PurposeAndContext(**meeting_dict["purpose_and_context"])
-        goal = Goal(objectives=meeting_dict["goal"]["objectives"])
-        docs = [Document(**d) for d in meeting_dict["briefing_materials"]["documents"]]
-        briefing = BriefingMaterials(documents=docs)
-        protocol = ProtocolReminder(**meeting_dict["protocol_reminder"])
-        opening = OpeningMessage(**meeting_dict["opening_message"])
-        
-        meeting_setup = MeetingSetup(
-            date=meeting_dict["date"],
-            time=meeting_dict["time"],
-            location=location,
-            recent_events=events,
-            summary_of_last_meetings=meeting_dict["summary_of_last_meetings"],
-            tags_keywords=meeting_dict.get("tags_keywords", ["<not_ready>"]),
-            category=meeting_dict.get("category", "<not_ready>"),
-            room_setup=room_setup,
-            purpose_and_context=purpose_ctx,
-            goal=goal,
-            briefing_materials=briefing,
-            protocol_reminder=protocol,
-            opening_message=opening,
-            agenda_outline=meeting_dict["agenda_outline"]
-        )
-        
-        # Create SetupData object
-        setup_data = SetupData(
-            id=setup_dict["id"],
-            version=setup_dict["version"],
-            name=setup_dict["name"],
-            topic=setup_dict["topic"],
-            logkeeper=Logkeeper(**setup_dict["logkeeper"]),
-            simulation_time=setup_dict["simulation_time"],
-            characters=characters,
-            world_or_simulation_context=world_ctx,
-            meeting_setup=meeting_setup
-        )
+        setup_data = SetupData.from_dict(setup_dict)
         
         # Get manager model with improved prompt
-        available_models = ["openai-gpt", "claude", "gemini", "deepseek", "ollama"]
+        available_models = AI_MODELS
         model_prompt = (
             "Enter a model name for the 'group chat manager'\n"
             f"Available models: {', '.join(available_models)}\n"
@@ -116,14 +59,13 @@ def cli_run_conversation(setup_file: str):
         )
         manager_model = input(model_prompt)
         if not manager_model:
-            import random
             manager_model = random.choice(available_models)
         
         # Create manager config
         manager_config = ManagerConfig(manager_model=manager_model)
         
         # Create log file path
-        timestamp = get_timestamp().replace(":", "").replace(" ", "_")
+        timestamp = get_file_timestamp()
         log_file_path = f"meeting_log_{timestamp}.json"
         print(f"\nConversation log will be saved to: {log_file_path}")
         
@@ -151,6 +93,9 @@ def cli_run_conversation(setup_file: str):
         traceback.print_exc()  # Print full error trace for debugging
 
 def main():
+    # Progress messages from the library modules go to the console (LOG_LEVEL=WARNING to silence them)
+    logging.basicConfig(level=(os.getenv("LOG_LEVEL") or "INFO").upper(), format="%(message)s")
+
     # Initialize cache manager first
     init_cache()
     
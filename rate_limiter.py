@@ -0,0 +1,82 @@
+"""
+Per-provider rate limiting for AI model calls.
+
+Each provider gets a RateLimiter that bounds in-flight requests with a semaphore
+and paces request starts with a token bucket (QPM = requests per minute).
+"""
+
+import os
+import time
+import asyncio
+from typing import Dict
+
+# Env var prefix per model name, matching the *_API_KEY names in .env
+PROVIDER_ENV_PREFIX = {
+    "openai-gpt": "OPENAI",
+    "claude": "ANTHROPIC",
+    "gemini": "GOOGLE",
+    "deepseek": "DEEPSEEK",
+    "ollama": "OLLAMA",
+}
+
+# (requests per minute, max in-flight requests); Ollama queues requests one at a time
+DEFAULT_LIMITS = {
+    "openai-gpt": (500, 10),
+    "claude": (50, 5),
+    "gemini": (60, 5),
+    "deepseek": (60, 5),
+    "ollama": (50, 1),
+}
+
+class RateLimiter:
+    """
+    Semaphore + token bucket for one provider.
+    Use as `async with limiter:` to hold a concurrency slot, then
+    `await limiter.acquire_token()` before starting the request.
+    """
+    def __init__(self, rate_per_minute: int, max_concurrency: int):
+        self.rate_per_minute = rate_per_minute
+        self.max_concurrency = max(1, max_concurrency)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._lock = asyncio.Lock()
+        # Allow a burst of up to max_concurrency requests, then refill at QPM/60 per second
+        self._capacity = float(self.max_concurrency)
+        self._tokens = self._capacity
+        self._refill_per_second = rate_per_minute / 60
+        self._updated = time.monotonic()
+
+    async def acquire_token(self):
+        """Wait until the token bucket allows another request (no-op when QPM is 0)"""
+        if self._refill_per_second <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._refill_per_second)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._refill_per_second)
+
+    async def __aenter__(self):
+        await self._semaphore.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._semaphore.release()
+
+_limiters: Dict[str, RateLimiter] = {}
+
+def get_rate_limiter(model_name: str) -> RateLimiter:
+    """Return the shared limiter for model_name, configured from <PREFIX>_QPM / <PREFIX>_MAX_CONC"""
+    limiter = _limiters.get(model_name)
+    if limiter is None:
+        prefix = PROVIDER_ENV_PREFIX.get(model_name, model_name.upper().replace("-", "_"))
+        default_qpm, default_conc = DEFAULT_LIMITS.get(model_name, (60, 5))
+        limiter = RateLimiter(
+            rate_per_minute=int(os.getenv(f"{prefix}_QPM", default_qpm)),
+            max_concurrency=int(os.getenv(f"{prefix}_MAX_CONC", default_conc)),
+        )
+        _limiters[model_name] = limiter
+    return limiter
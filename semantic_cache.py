@@ -0,0 +1,143 @@
+"""
+Semantic cache for AI responses.
+
+Complements the exact-match cache in cache_manager: a prompt's key text is embedded and, if a
+previously answered prompt for the same namespace (model and prompt template) is close
+enough by cosine similarity, that stored response is returned instead of calling the API.
+Rows are appended to a JSON Lines file, one per stored response; a deletion is appended as a
+{"namespace", "prompt", "deleted": true} line that drops the earlier rows for that prompt on load.
+"""
+
+import os
+import math
+import time
+from typing import Dict, List, Optional, Tuple
+
+from cache_manager import CACHE_DIR, DEFAULT_EXPIRY_SECONDS
+from utils import json_dumps, json_loads
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # Falls back to a pure-Python similarity scan
+
+SEMANTIC_CACHE_FILE = "semantic_cache.jsonl"
+DEFAULT_SIMILARITY_THRESHOLD = 0.97
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+def _normalize(vector: List[float]) -> List[float]:
+    norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+    return [x / norm for x in vector]
+
+class SemanticCache:
+    def __init__(self, threshold: float = DEFAULT_SIMILARITY_THRESHOLD):
+        self.threshold = threshold
+        self.cache_file = os.path.join(CACHE_DIR, SEMANTIC_CACHE_FILE)
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # namespace -> list of {"namespace", "embedding", "prompt", "response", "usage_info", "expires_at"}
+        self._rows: Dict[str, List[Dict]] = self._load()
+        # namespace -> stacked embedding matrix (numpy only), rebuilt when rows change
+        self._matrices: Dict[str, "np.ndarray"] = {}
+
+    def _load(self) -> Dict[str, List[Dict]]:
+        """Load stored rows, dropping expired ones and any line left incomplete by an interrupted write"""
+        rows: Dict[str, List[Dict]] = {}
+        try:
+            with open(self.cache_file, 'rb') as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return rows
+        except Exception as e:
+            print(f"Error loading semantic cache: {str(e)}")
+            return rows
+        now = time.time()
+        for line in lines:
+            try:
+                row = json_loads(line)
+            except ValueError:
+                continue
+            if row.get("deleted"):
+                kept = [r for r in rows.get(row["namespace"], []) if r["prompt"] != row["prompt"]]
+                rows[row["namespace"]] = kept
+            elif row["expires_at"] > now:
+                rows.setdefault(row["namespace"], []).append(row)
+        return rows
+
+    def _append(self, row: Dict):
+        """Append one row to the cache file instead of rewriting the whole file"""
+        with open(self.cache_file, 'a', encoding='utf-8') as f:
+            f.write(json_dumps(row) + "\n")
+
+    def _nearest(self, embedding: List[float], namespace: str) -> Optional[Tuple[Dict, float]]:
+        """The stored row nearest to embedding and its similarity, if above threshold and not expired"""
+        rows = self._rows.get(namespace)
+        if not rows:
+            return None
+        query = _normalize(embedding)
+        if np is not None:
+            matrix = self._matrices.get(namespace)
+            if matrix is None:
+                matrix = np.array([row["embedding"] for row in rows], dtype=np.float32)
+                self._matrices[namespace] = matrix
+            scores = matrix @ np.asarray(query, dtype=np.float32)
+            # On ties the newest row wins, like the max() below
+            best = len(rows) - 1 - int(scores[::-1].argmax())
+            similarity = float(scores[best])
+        else:
+            similarity, best = max(
+                (sum(a * b for a, b in zip(row["embedding"], query)), i)
+                for i, row in enumerate(rows)
+            )
+        if similarity < self.threshold:
+            return None
+        row = rows[best]
+        if row["expires_at"] <= time.time():
+            return None
+        return row, similarity
+
+    def lookup(self, embedding: List[float], namespace: str) -> Optional[Tuple[str, Dict, float]]:
+        """Return (response, usage_info, similarity) of the nearest stored prompt if above threshold"""
+        nearest = self._nearest(embedding, namespace)
+        if nearest is None:
+            return None
+        row, similarity = nearest
+        return row["response"], {**row["usage_info"], 'cached': True}, similarity
+
+    def nearest_prompt(self, embedding: List[float], namespace: str) -> Optional[str]:
+        """The stored prompt whose response lookup() would return, if any"""
+        nearest = self._nearest(embedding, namespace)
+        return nearest[0]["prompt"] if nearest is not None else None
+
+    def delete(self, namespace: str, prompt: str):
+        """Drop the stored responses for prompt (e.g. one that was rejected) and persist the deletion"""
+        rows = self._rows.get(namespace)
+        if not rows or not any(row["prompt"] == prompt for row in rows):
+            return
+        self._rows[namespace] = [row for row in rows if row["prompt"] != prompt]
+        self._matrices.pop(namespace, None)
+        self._append({"namespace": namespace, "prompt": prompt, "deleted": True})
+
+    def add(self, embedding: List[float], namespace: str, prompt: str, response: str, usage_info: Dict):
+        """Store a response under the prompt embedding and persist"""
+        row = {
+            "namespace": namespace,
+            "embedding": _normalize(embedding),
+            "prompt": prompt,
+            "response": response,
+            "usage_info": usage_info,
+            "expires_at": time.time() + DEFAULT_EXPIRY_SECONDS,
+        }
+        self._rows.setdefault(namespace, []).append(row)
+        self._matrices.pop(namespace, None)
+        self._append(row)
+
+# Global semantic cache instance (None when disabled)
+semantic_cache = None
+
+def get_semantic_cache() -> Optional[SemanticCache]:
+    """Return the global semantic cache if SEMANTIC_CACHE_ENABLED is set, creating it on first use"""
+    global semantic_cache
+    if semantic_cache is None and os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() in ['true', '1', 'yes', 'on']:
+        threshold = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", DEFAULT_SIMILARITY_THRESHOLD))
+        semantic_cache = SemanticCache(threshold)
+    return semantic_cache
@@ -6,15 +6,20 @@ Utility functions for random model selection, time stamps, logging, etc.
 
 import json
 import random
+import re
 import time
-from datetime import datetime
+import functools
 from typing import Dict, Any, Tuple, Optional
 import os
 from dotenv import load_dotenv
 
-# Load environment variables at module level
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Falls back to the stdlib json module
+
+# Load environment variables at module level (the other modules read their settings at import)
 load_dotenv()
-print(f"Utils: Environment loaded, PROMPT_DEBUG = {os.getenv('PROMPT_DEBUG')}")
 
 # Add these color constants at the top of utils.py
 class Colors:
@@ -22,9 +27,41 @@ class Colors:
     GREEN = '\033[92m'
     RESET = '\033[0m'
 
+def json_dumps(obj, indent: bool = False) -> str:
+    """Serialize obj to a JSON string, compact unless indent is set (2 spaces). Uses orjson when installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode("utf-8")
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False)
+
+def json_loads(data):
+    """Parse JSON from str or bytes. Uses orjson when installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dataclass_to_dict(obj):
+    """
+    Like dataclasses.asdict for the plain data in data_structures (dataclasses, lists, tuples, dicts),
+    but without asdict's deepcopy of every leaf value, which makes it about twice as fast
+    """
+    fields = getattr(type(obj), "__dataclass_fields__", None)
+    if fields is not None:
+        return {name: dataclass_to_dict(getattr(obj, name)) for name in fields}
+    if isinstance(obj, (list, tuple)):
+        return type(obj)(dataclass_to_dict(v) for v in obj)
+    if isinstance(obj, dict):
+        return {k: dataclass_to_dict(v) for k, v in obj.items()}
+    return obj
+
 def get_timestamp() -> str:
     """Return current timestamp as a string."""
-    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return time.strftime("%Y-%m-%d %H:%M:%S")
+
+def get_file_timestamp() -> str:
+    """Return current timestamp for file names, e.g. 2025-01-31_142500"""
+    return time.strftime("%Y-%m-%d_%H%M%S")
 
 def write_json_to_file(data: dict, filename: str):
     """Write dictionary to JSON file with proper formatting"""
@@ -42,37 +79,88 @@ def write_json_to_file(data: dict, filename: str):
             "meeting_setup": data["meeting_setup"]
         }
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(ordered_data, f, indent=2, ensure_ascii=False)
+        # Serialized to one UTF-8 buffer (orjson when installed) and written in a single call,
+        # instead of json.dump streaming many small str chunks through a text-mode file
+        if orjson is not None:
+            buf = orjson.dumps(ordered_data, option=orjson.OPT_INDENT_2)
+        else:
+            buf = json.dumps(ordered_data, indent=2, ensure_ascii=False).encode('utf-8')
+        with open(filename, 'wb') as f:
+            f.write(buf)
             
     except Exception as e:
         print(f"Error writing to {filename}: {e}")
-        print("Data was:", json.dumps(data, indent=2))
+        print("Data was:", json_dumps(data, indent=True))
 
-def append_json_log(log_entry, file_path: str):
+class JsonArrayLog:
     """
-    Append a single log entry to an existing JSON array in the file.
-    If the file does not exist, create a new JSON file with an array.
+    Appends entries to a JSON array file through one open file, without re-reading or rewriting
+    what is already there. The file holds a complete, indented JSON array after every append,
+    so it can be read while the conversation is running.
     """
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            existing_data = json.load(f)
-        if not isinstance(existing_data, list):
-            existing_data = []
-    except FileNotFoundError:
-        existing_data = []
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._file = None
+        self._end = 0  # Offset of the closing "\n]" once the array has entries, else 0
 
-    existing_data.append(log_entry)
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(existing_data, f, indent=2, ensure_ascii=False)
+    def _open(self):
+        """Open the file, keeping the entries of an existing JSON array"""
+        try:
+            self._file = open(self.file_path, "r+b")
+            data = self._file.read()
+            existing = json_loads(data) if data.strip() else []
+        except FileNotFoundError:
+            self._file = open(self.file_path, "w+b")
+            existing = []
+        except json.JSONDecodeError:
+            existing = None
+        if isinstance(existing, list) and existing:
+            # Appends go before the closing bracket of the existing array
+            self._end = data.rstrip().rindex(b"]")
+            while self._end and data[self._end - 1:self._end] in (b"\n", b" ", b"\r", b"\t"):
+                self._end -= 1
+        else:
+            # Anything that is not a JSON array is replaced
+            self._file.seek(0)
+            self._file.truncate()
+            self._end = 0
+
+    def append(self, log_entry):
+        """Append one entry and flush, leaving a valid JSON array on disk"""
+        if self._file is None:
+            self._open()
+        entry = ("  " + json_dumps(log_entry, indent=True).replace("\n", "\n  ")).encode("utf-8")
+        if self._end:
+            self._file.seek(self._end)
+            self._file.write(b",\n" + entry)
+        else:
+            self._file.write(b"[\n" + entry)
+        self._end = self._file.tell()
+        self._file.write(b"\n]")
+        self._file.flush()
+
+    def close(self):
+        """Close the file; a later append opens it again"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+# Model names that can be assigned to characters or the group chat manager
+AI_MODELS = ("openai-gpt", "claude", "gemini", "deepseek", "ollama")
 
 def get_random_ai_model() -> str:
     """
     Return a random AI model name from the predefined set.
     e.g., ["OpenAI GPT", "Claude", "Gemini", "DeepSeek", "Ollama"]
     """
-    models = ["openai-gpt", "claude", "gemini", "deepseek", "ollama"]
-    return random.choice(models)
+    return random.choice(AI_MODELS)
+
+# Manager check lines that are not part of the conversation itself
+_SYSTEM_LINE = re.compile(r"SystemCheck:|.*\[(?:Goal|Closing) Check\]")
+
+def filter_system_lines(conversation: str) -> str:
+    """Drop SystemCheck / [Goal Check] / [Closing Check] lines from a conversation transcript"""
+    return '\n'.join(line for line in conversation.split('\n') if not _SYSTEM_LINE.match(line))
 
 def approximate_word_count(text: str) -> int:
     """Approximate the word count of a text."""
@@ -99,6 +187,8 @@ def get_conversation_stats(conversation_id: str) -> Dict[str, Any]:
     }
 
 class DebugPromptManager:
+    __slots__ = ("debug_enabled", "show_only", "skip_debug")
+
     def __init__(self):
         # Load both debug settings
         debug_env = os.getenv("PROMPT_DEBUG", "false").lower()
@@ -108,7 +198,8 @@ class DebugPromptManager:
         self.debug_enabled = debug_env in ['true', '1', 'yes', 'on']
         self.show_only = show_only_env in ['true', '1', 'yes', 'on']
         
-        print(f"Debug Manager Initialized - Interactive Debug: {self.debug_enabled}, Show Only: {self.show_only}")
+        if self.debug_enabled or self.show_only:
+            print(f"Debug Manager Initialized - Interactive Debug: {self.debug_enabled}, Show Only: {self.show_only}")
         self.skip_debug = False
     
     def should_debug(self) -> bool:
@@ -164,13 +255,14 @@ class DebugPromptManager:
                 return choice
             return 'y'  # Auto-continue if show-only mode
 
-# Global debug manager instance
-debug_manager = DebugPromptManager()
+@functools.lru_cache(maxsize=1)
+def get_debug_manager() -> DebugPromptManager:
+    """The shared debug manager, created on first use"""
+    return DebugPromptManager()
 
 def debug_prompt(prompt: str) -> bool:
     """Returns True to proceed, False to exit"""
-    print(f"Debug: PROMPT_DEBUG is set to: {os.getenv('PROMPT_DEBUG')}")
-    choice = debug_manager.prompt_user(prompt)
+    choice = get_debug_manager().prompt_user(prompt)
     if choice == 'n':
         print("Debug: Exiting program due to prompt rejection")
         exit(0)
@@ -184,7 +276,7 @@ def debug_response(prompt: str, response: Tuple[str, dict]) -> Tuple[bool, bool]
     is_cached = usage_info.get('cached', False)  # We'll add this flag
     model_name = "cache" if is_cached else usage_info.get('model', 'unknown')
     
-    choice = debug_manager.prompt_user(prompt, (response_text, {
+    choice = get_debug_manager().prompt_user(prompt, (response_text, {
         **usage_info,
         'model': model_name
     }))